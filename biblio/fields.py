@@ -12,45 +12,51 @@ Date = namedtuple("Date", ["year", "month", "day", "circa", "time"])
 # Constants, classes, and mappings
 #################################################################
 
-PARTICLES = {
-    "al",
-    "bin",
-    "da",
-    "de",
-    "de la",
-    "Du",
-    "la",
-    "van",
-    "van den",
-    "van der",
-    "von",
-    "Van",
-    "Von",
-}
-SUFFIXES = {"Jr.", "Sr.", "II", "III", "IV"}
+PARTICLES = frozenset(
+    {
+        "al",
+        "bin",
+        "da",
+        "de",
+        "de la",
+        "Du",
+        "la",
+        "van",
+        "van den",
+        "van der",
+        "von",
+        "Van",
+        "Von",
+    }
+)
+SUFFIXES = frozenset({"Jr.", "Sr.", "II", "III", "IV"})
 
-ARTICLES = {"a", "an", "the"}
-CONJUNCTIONS = {"and", "but", "nor", "or"}
-SHORT_PREPOSITIONS = {
-    "among",
-    "as",
-    "at",
-    "by",
-    "for",
-    "from",
-    "in",
-    "of",
-    "on",
-    "out",
-    "per",
-    "to",
-    "upon",
-    "with",
-}
-JUNK_WORDS = {
-    "",
-    "re",
-}
+ARTICLES = frozenset({"a", "an", "the"})
+CONJUNCTIONS = frozenset({"and", "but", "nor", "or"})
+SHORT_PREPOSITIONS = frozenset(
+    {
+        "among",
+        "as",
+        "at",
+        "by",
+        "for",
+        "from",
+        "in",
+        "of",
+        "on",
+        "out",
+        "per",
+        "to",
+        "upon",
+        "with",
+    }
+)
+JUNK_WORDS = frozenset(
+    {
+        "",
+        "re",
+    }
+)
 BORING_WORDS = ARTICLES | CONJUNCTIONS | SHORT_PREPOSITIONS | JUNK_WORDS
 # BORING_WORDS used in identity_add_title() and bibformat_title()
 # Not imported from change_case because it's an expensive import
@@ -133,8 +139,7 @@ CSL_SHORTCUTS = {
     "cw": "c_web",
 }
 
-BIB_SHORTCUTS = BIBLATEX_SHORTCUTS.copy()
-BIB_SHORTCUTS.update(CSL_SHORTCUTS)
+BIB_SHORTCUTS = BIBLATEX_SHORTCUTS | CSL_SHORTCUTS
 BIB_SHORTCUTS_ITEMS = sorted(BIB_SHORTCUTS.items(), key=lambda t: t[1])
 
 BIB_FIELDS = {field: short for (short, field) in BIB_SHORTCUTS.items()}
@@ -146,63 +151,67 @@ CONTAINERS = list(CSL_SHORTCUTS.values())
 #   leads to duplicate "container-title" errors in YAML parsing
 # CONTAINERS.append('organization')
 
-BIBLATEX_TYPES = {
-    "article",
-    "book",
-    "booklet",
-    "collection",  # the larger mutli-author book with editor
-    "inbook",  # chapter in a book by a single author
-    "incollection",  # chapter in multi-authored book with editor
-    "inproceedings",
-    "manual",
-    "mastersthesis",
-    "misc",
-    "phdthesis",
-    "report",
-    "unpublished",
-    "patent",
-    "periodical",
-    "proceedings",
-    "online",
-}
+BIBLATEX_TYPES = frozenset(
+    {
+        "article",
+        "book",
+        "booklet",
+        "collection",  # the larger mutli-author book with editor
+        "inbook",  # chapter in a book by a single author
+        "incollection",  # chapter in multi-authored book with editor
+        "inproceedings",
+        "manual",
+        "mastersthesis",
+        "misc",
+        "phdthesis",
+        "report",
+        "unpublished",
+        "patent",
+        "periodical",
+        "proceedings",
+        "online",
+    }
+)
 
-CSL_TYPES = {
-    "article",
-    "article-magazine",
-    "article-newspaper",
-    "article-journal",
-    "bill",
-    "book",
-    "broadcast",
-    "chapter",
-    "dataset",
-    "entry",
-    "entry-dictionary",
-    "entry-encyclopedia",
-    "figure",
-    "graphic",
-    "interview",
-    "legislation",
-    "legal_case",
-    "manuscript",
-    "map",
-    "motion_picture",
-    "musical_score",
-    "pamphlet",
-    "paper-conference",
-    "patent",
-    "post",
-    "post-weblog",
-    "personal_communication",
-    "report",
-    "review",
-    "review-book",
-    "song",
-    "speech",
-    "thesis",
-    "treaty",
-    "webpage",
-}
+CSL_TYPES = frozenset(
+    {
+        "article",
+        "article-magazine",
+        "article-newspaper",
+        "article-journal",
+        "bill",
+        "book",
+        "broadcast",
+        "chapter",
+        "dataset",
+        "entry",
+        "entry-dictionary",
+        "entry-encyclopedia",
+        "figure",
+        "graphic",
+        "interview",
+        "legislation",
+        "legal_case",
+        "manuscript",
+        "map",
+        "motion_picture",
+        "musical_score",
+        "pamphlet",
+        "paper-conference",
+        "patent",
+        "post",
+        "post-weblog",
+        "personal_communication",
+        "report",
+        "review",
+        "review-book",
+        "song",
+        "speech",
+        "thesis",
+        "treaty",
+        "webpage",
+    }
+)
 
 BIB_TYPES = BIBLATEX_TYPES | CSL_TYPES
 
@@ -229,7 +238,7 @@ CSL_BIBLATEX_TYPE_MAP = {
     "webpage":                  "online"
 }
 
-BIBLATEX_CSL_TYPE_MAP = {v: k for k, v in list(CSL_BIBLATEX_TYPE_MAP.items())}
+BIBLATEX_CSL_TYPE_MAP = {v: k for k, v in CSL_BIBLATEX_TYPE_MAP.items()}
 
 BIBLATEX_CSL_FIELD_MAP = {
     "address":              "publisher-place",
@@ -255,7 +264,7 @@ BIBLATEX_CSL_FIELD_MAP = {
     "catalog":              "call-number",
 }
 
-CSL_BIBLATEX_FIELD_MAP = {v: k for k, v in list(BIBLATEX_CSL_FIELD_MAP.items())}
+CSL_BIBLATEX_FIELD_MAP = {v: k for k, v in BIBLATEX_CSL_FIELD_MAP.items()}
 
 # https://en.wikipedia.org/wiki/Template:Citation
 BIBLATEX_WP_FIELD_MAP = {
@@ -275,32 +284,34 @@ BIBLATEX_WP_FIELD_MAP = {
 
 # fmt: on
 
-WP_BIBLATEX_FIELD_MAP = {v: k for k, v in list(BIBLATEX_WP_FIELD_MAP.items())}
+WP_BIBLATEX_FIELD_MAP = {v: k for k, v in BIBLATEX_WP_FIELD_MAP.items()}
 
-BIBTEX_FIELDS = {
-    "address",
-    "annote",
-    "author",
-    "booktitle",
-    "chapter",
-    "crossref",
-    "edition",
-    "editor",
-    "howpublished",
-    "institution",
-    "journal",
-    "key",
-    "note",
-    "number",
-    "organization",
-    "pages",
-    "publisher",
-    "school",
-    "series",
-    "title",
-    "type",
-    "volume",
-}
+BIBTEX_FIELDS = frozenset(
+    {
+        "address",
+        "annote",
+        "author",
+        "booktitle",
+        "chapter",
+        "crossref",
+        "edition",
+        "editor",
+        "howpublished",
+        "institution",
+        "journal",
+        "key",
+        "note",
+        "number",
+        "organization",
+        "pages",
+        "publisher",
+        "school",
+        "series",
+        "title",
+        "type",
+        "volume",
+    }
+)
 
 BIBLATEX_FIELDS = BIBTEX_FIELDS | {
     "addendum",
@@ -334,24 +345,28 @@ BIBLATEX_FIELDS = BIBTEX_FIELDS | {
 # url not original bibtex standard, but is common,
 # so I include it here and also include it in the note in emit_biblatex.
 
-EXCLUDE_URLS = {
-    "search?q=cache",
-    "proquest",
-    "ezproxy",
-    "books.google",
-    "amazon.com",
-    "data/1work/",
-}
-ONLINE_JOURNALS = {
-    "firstmonday.org",
-    "media-culture.org",
-    "salon.com",
-    "slate.com",
-}
+EXCLUDE_URLS = frozenset(
+    {
+        "search?q=cache",
+        "proquest",
+        "ezproxy",
+        "books.google",
+        "amazon.com",
+        "data/1work/",
+    }
+)
+ONLINE_JOURNALS = frozenset(
+    {
+        "firstmonday.org",
+        "media-culture.org",
+        "salon.com",
+        "slate.com",
+    }
+)
 
 SITE_CONTAINER_MAP = (
     ("arstechnica.com", "Ars Technica", "c_newspaper"),
-    ("atlantic.com", "The Atlantic", "c_magazine"),
+    ("theatlantic.com", "The Atlantic", "c_magazine"),
     ("boingboing.net", "Boing Boing", "c_blog"),
     ("dailydot", "The Daily Dot", "c_newspaper"),
     ("engadget.com", "Engadget", "c_blog"),
@@ -365,7 +380,7 @@ SITE_CONTAINER_MAP = (
     ("slate.com", "Slate", "c_magazine"),
     ("techcrunch.com", "TechCrunch", "c_newspaper"),
     ("theguardian", "The Guardian", "c_newspaper"),
-    ("verge.com", "The Verge", "c_newspaper"),
+    ("theverge.com", "The Verge", "c_newspaper"),
     ("Wikipedia_Signpost", "Wikipedia Signpost", "c_web"),
     ("wired.com", "Wired", "c_magazine"),
     ("wsj.com", "The Wall Street Journal", "c_newspaper"),
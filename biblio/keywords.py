@@ -7,6 +7,8 @@ __author__ = "Joseph Reagle"
 __copyright__ = "Copyright (C) 2009-2023 Joseph Reagle"
 __license__ = "GLPv3"
 
+import functools
+
 # General
 GENERAL_KEY_SHORTCUTS = {
     "aca": "academia",
@@ -153,6 +155,43 @@ LIST_OF_KEYSHORTCUTS = (
     TV_KEY_SHORTCUTS,
 )
 
-KEY_SHORTCUTS = LIST_OF_KEYSHORTCUTS[0].copy()
-for short_dict in LIST_OF_KEYSHORTCUTS[1:]:
-    KEY_SHORTCUTS.update(short_dict)
+KEY_SHORTCUTS = {
+    **GENERAL_KEY_SHORTCUTS,
+    **ADVICE_KEY_SHORTCUTS,
+    **GF_KEY_SHORTCUTS,
+    **RTC_KEY_SHORTCUTS,
+    **WP_KEY_SHORTCUTS,
+    **LH_KEY_SHORTCUTS,
+    **TV_KEY_SHORTCUTS,
+}
+
+
+def find_shortcut_collisions() -> dict[str, tuple[str, ...]]:
+    """Return shortcuts given different keywords, the last of which wins."""
+    keywords: dict[str, list[str]] = {}
+    for short_dict in LIST_OF_KEYSHORTCUTS:
+        for short, keyword in short_dict.items():
+            keywords.setdefault(short, [])
+            if keyword not in keywords[short]:
+                keywords[short].append(keyword)
+    return {short: tuple(kws) for short, kws in keywords.items() if len(kws) > 1}
+
+
+@functools.cache
+def expand_tags(tags: str) -> tuple[str, ...]:
+    """Expand space-separated tag shortcuts into their keywords.
+
+    >>> expand_tags("wp adv nonesuch")
+    ('wikipedia', 'advice', 'nonesuch')
+    """
+    return tuple(KEY_SHORTCUTS.get(tag, tag) for tag in tags.split())
+
+
+@functools.cache
+def hashify_tags(tags: str) -> str:
+    """Expand tag shortcuts into a string of hashtags.
+
+    >>> hashify_tags("wp adv")
+    '#wikipedia #advice'
+    """
+    return " ".join(f"#{tag}" for tag in expand_tags(tags))
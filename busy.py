@@ -49,6 +49,31 @@ from utils.web import canonicalize_url
 NOW = time.localtime()
 MONTHS = "jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec"
 
+# tags must be prefixed by dot; URL no longer required
+RE_LOG = re.compile(
+    r"(?P<scheme>\w) (?P<tags>(\.\w+ )+)?"
+    + r"(?P<url>(arxiv|doi|isbn|http|file)\S* ?)?(?P<comment>.*)",
+    re.IGNORECASE,
+)
+# host: (path prefix, scraper)
+SCRAPERS_BY_HOST = {
+    "en.wikipedia.org": ("/w", ScrapeENWP),
+    "marc.info": ("/", ScrapeMARC),
+    "meta.wikimedia.org": ("/w", ScrapeWMMeta),
+    "ohai.social": ("/", ScrapeMastodon),
+    "twitter.com": ("/", ScrapeTwitter),
+    "www.nytimes.com": ("/", ScrapeNYT),
+    "www.reddit.com": ("/", ScrapeReddit),
+}
+LOGGERS = {
+    "n": log2nifty,
+    "j": log2work,
+    "m": log2mm,
+    "c": log2console,
+    "o": log2opencodex,
+    "g": log2goatee,
+}
+
 #######################################
 # Dispatchers
 #######################################
@@ -77,19 +102,10 @@ def get_scraper(url: str, comment: str) -> ScrapeDefault:
     elif url.lower().startswith("arxiv:"):
         return ScrapeArXiv(url, comment)
     else:
-        host_path = url.split("//")[1]
-        dispatch_scraper = (
-            ("en.wikipedia.org/w", ScrapeENWP),
-            ("marc.info/", ScrapeMARC),
-            ("meta.wikimedia.org/w", ScrapeWMMeta),
-            ("ohai.social/", ScrapeMastodon),
-            ("twitter.com/", ScrapeTwitter),
-            ("www.nytimes.com/", ScrapeNYT),
-            ("www.reddit.com/", ScrapeReddit),
-        )
-
-        for prefix, scraper in dispatch_scraper:
-            if host_path.startswith(prefix):
+        host, slash, path = url.split("//")[1].partition("/")
+        if scraper_entry := SCRAPERS_BY_HOST.get(host):
+            path_prefix, scraper = scraper_entry
+            if f"{slash}{path}".startswith(path_prefix):
                 log.info(f"scrape = {scraper} ")
                 return scraper(url, comment)  # creates instance
 
@@ -99,47 +115,28 @@ def get_scraper(url: str, comment: str) -> ScrapeDefault:
 
 def get_logger(text: str) -> tuple[Callable, dict]:
     """Given the argument return a function and parameters."""
-    # tags must be prefixed by dot; URL no longer required
-    LOG_REGEX = re.compile(
-        r"(?P<scheme>\w) (?P<tags>(\.\w+ )+)?"
-        + r"(?P<url>(arxiv|doi|isbn|http|file)\S* ?)?(?P<comment>.*)",
-        re.IGNORECASE,
-    )
-
-    if LOG_REGEX.match(text):
-        params = {}
-        if (match := LOG_REGEX.match(text)) is not None:
-            params = match.groupdict()
-        if params.get("tags"):
-            params["tags"] = params["tags"].replace(".", "")
-        if params.get("url"):
-            # unescape zshell safe pasting/bracketing
-            params["url"] = (
-                params["url"]
-                .replace(r"\#", "#")
-                .replace(r"\&", "&")
-                .replace(r"\?", "?")
-                .replace(r"\=", "=")
-            )
+    if (match := RE_LOG.match(text)) is None:
+        print_usage(f"Sorry, I can't parse the argument: '{text}'.")
+        sys.exit()
 
-        log.info(f"params = '{params}'")
-        function_map = {
-            "n": log2nifty,
-            "j": log2work,
-            "m": log2mm,
-            "c": log2console,
-            "o": log2opencodex,
-            "g": log2goatee,
-        }
-        function = function_map.get(params["scheme"], None)
+    params = match.groupdict()
+    if params.get("tags"):
+        params["tags"] = params["tags"].replace(".", "")
+    if params.get("url"):
+        # unescape zshell safe pasting/bracketing
+        params["url"] = (
+            params["url"]
+            .replace(r"\#", "#")
+            .replace(r"\&", "&")
+            .replace(r"\?", "?")
+            .replace(r"\=", "=")
+        )
+    log.info(f"params = '{params}'")
 
-        if function:
-            return function, params
-        else:
-            print_usage(f"""Sorry, unknown scheme: '{params["scheme"]}'.""")
-    else:
-        print_usage(f"Sorry, I can't parse the argument: '{text}'.")
-    sys.exit()
+    if (function := LOGGERS.get(params["scheme"])) is None:
+        print_usage(f"""Sorry, unknown scheme: '{params["scheme"]}'.""")
+        sys.exit()
+    return function, params
 
 
 #######################################
@@ -19,28 +19,32 @@ from pathlib import Path
 
 from config import BIN_DIR
 
-ARTICLES = {"a", "an", "the"}
-CONJUNCTIONS = {"and", "but", "nor", "or"}
-SHORT_PREPOSITIONS = {
-    "among",
-    "as",
-    "at",
-    "by",
-    "for",
-    "from",
-    "in",
-    "of",
-    "on",
-    "out",
-    "per",
-    "to",
-    "upon",
-    "with",
-}
-JUNK_WORDS = {
-    "",
-    "re",
-}
+ARTICLES = frozenset({"a", "an", "the"})
+CONJUNCTIONS = frozenset({"and", "but", "nor", "or"})
+SHORT_PREPOSITIONS = frozenset(
+    {
+        "among",
+        "as",
+        "at",
+        "by",
+        "for",
+        "from",
+        "in",
+        "of",
+        "on",
+        "out",
+        "per",
+        "to",
+        "upon",
+        "with",
+    }
+)
+JUNK_WORDS = frozenset(
+    {
+        "",
+        "re",
+    }
+)
 BORING_WORDS = ARTICLES | CONJUNCTIONS | SHORT_PREPOSITIONS | JUNK_WORDS
 # BORING_WORDS is used in safe_capwords() and change_case() below.
 # Not used by thunderdell.py because it doesn't require slow
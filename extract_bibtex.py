@@ -10,123 +10,119 @@ __version__ = "1.0"
 # - convert about to biblatex date format (d=)
 # - handle name variances (e.g., "First Last" without comma)
 
+import functools
 import logging as log
 import re
 from pathlib import Path  # https://docs.python.org/3/library/pathlib.html
 
-HOME = Path.home()
-
-
-def regex_parse(text: list[str]) -> dict[str, dict[str, str]]:
+# A line is either the beginning/id of an entry or one of its fields;
+# keys/IDs are assumed to be alone on a single line
+RE_BIBTEX_LINE = re.compile(
+    r"^(?:@\w*{(?P<key>.*)|[^\S\n]*(?P<field>\w+) ?= ?{(?P<value>.*)},?)",
+    re.MULTILINE,
+)
+BRACES_TABLE = str.maketrans("", "", "{}")
+RE_LAST_FIRST = re.compile(r"([^,]+), (.+)")
+# As html.escape(text, quote=True) but in one pass
+XML_TABLE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
+# Citation shortcuts and their bibtex fields, in the order I like; it would
+# be more elegant to just loop through `from td import terms`
+CITE_FIELDS = (
+    ("y", "year"),
+    ("m", "month"),
+    ("bt", "booktitle"),
+    ("e", "editor"),
+    ("p", "publisher"),
+    ("a", "address"),
+    ("ed", "edition"),
+    ("ch", "chapter"),
+    ("pp", "pages"),
+    ("j", "journal"),
+    ("v", "volume"),
+    ("n", "number"),
+    ("doi", "doi"),
+    ("an", "annote"),
+    ("nt", "note"),
+)
+
+
+def regex_parse(text: str) -> dict[str, dict[str, str]]:
+    r"""Parse bibtex entries' fields with one scan over the text.
+
+    >>> regex_parse("@book{reagle2010,\n  title = {Good {Faith}},\n}")
+    {'reagle2010,': {'title': 'Good Faith'}}
+    """
     key = ""
     entries = {}
 
-    key_pattern = re.compile(r"@\w*{(.*)")  # Beginning/id of bibtex entry
-    value_pattern = re.compile(r"\s*(\w+) ?= ?{(.*)},?")
-
-    for line in text:
-        print(f"{line=}")
-        key_match = key_pattern.match(line)
-        if key_match:
-            key = key_match.group(1)
-            print(f"{key=}")
+    for line_match in RE_BIBTEX_LINE.finditer(text):
+        if (new_key := line_match["key"]) is not None:
+            key = new_key
+            log.info(f"{key=}")
             entries[key] = {}
-            continue  # Keys/IDs are assumed to be alone on single line
-        value_match = value_pattern.match(line)
-        if value_match:
-            field, value = value_match.groups()
-            print(f"{field=} {value=}")
-            entries[key][field] = value.replace("{", "").replace("}", "")
+        else:
+            field, value = line_match.group("field", "value")
+            log.info(f"{field=} {value=}")
+            entries[key][field] = value.translate(BRACES_TABLE)
     return entries
 
 
 def xml_escape(text: str) -> str:
-    """Remove entities and spurious whitespace."""
-    import html
+    """Remove entities and spurious whitespace.
+
+    >>> xml_escape(" Tom & Jerry's <3 ")
+    'Tom &amp; Jerry&#x27;s &lt;3'
+    """
+    return text.translate(XML_TABLE).strip()
+
 
-    escaped_text = html.escape(text, quote=True).strip()
-    return escaped_text
+@functools.cache
+def reorder_names(authors: str) -> str:
+    """Turn bibtex's "Last, First and ..." into escaped "First Last, ...".
+
+    Cached because a bibliography repeats its authors.
+
+    >>> reorder_names("Reagle, Joseph and Koerner, Jackie and Wikipedia")
+    'Joseph Reagle, Jackie Koerner, Wikipedia'
+    """
+    names = xml_escape(authors).split(" and ")
+    return ", ".join(RE_LAST_FIRST.sub(r"\2 \1", name) for name in names)
 
 
 def process(entries: dict, fdo):
     fdo.write("""<map version="1.11.1">\n<node TEXT="Readings">\n""")
 
-    for entry in list(entries.values()):
+    for entry in entries.values():
         log.info(f"entry = '{entry}'")
-        cite = []
-        reordered_names = []
-        names = xml_escape(entry["author"])
-        names = names.split(" and ")
-        for name in names:
-            last, first = name.split(", ")
-            reordered_names.append(first + " " + last)
-        fdo.write(
-            """  <node COLOR="#338800" TEXT="{}">\n""".format(
-                ", ".join(reordered_names)
-            )
-        )
+        names = reorder_names(entry["author"])
+        out = [f"""  <node COLOR="#338800" TEXT="{names}">\n"""]
 
+        title = xml_escape(entry["title"])
         if "url" in entry:
-            fdo.write(
-                """    <node COLOR="#090f6b" LINK="{}" TEXT="{}">\n""".format(
-                    xml_escape(entry["url"]), xml_escape(entry["title"])
-                )
+            out.append(
+                f"""    <node COLOR="#090f6b" LINK="{xml_escape(entry["url"])}" """
+                f"""TEXT="{title}">\n"""
             )
         else:
-            fdo.write(
-                """    <node COLOR="#090f6b" TEXT="{}">\n""".format(
-                    xml_escape(entry["title"])
-                )
-            )
+            out.append(f"""    <node COLOR="#090f6b" TEXT="{title}">\n""")
 
-        # it would be more elegant to just loop through
-        #   `from td import terms`
-        # but this creates an ordering that I like
-        if "year" in entry:
-            cite.append(("y", entry["year"]))
-        if "month" in entry:
-            cite.append(("m", entry["month"]))
-        if "booktitle" in entry:
-            cite.append(("bt", entry["booktitle"]))
-        if "editor" in entry:
-            cite.append(("e", entry["editor"]))
-        if "publisher" in entry:
-            cite.append(("p", entry["publisher"]))
-        if "address" in entry:
-            cite.append(("a", entry["address"]))
-        if "edition" in entry:
-            cite.append(("ed", entry["edition"]))
-        if "chapter" in entry:
-            cite.append(("ch", entry["chapter"]))
         if "pages" in entry:
             entry["pages"] = entry["pages"].replace("--", "-").replace(" ", "")
-            cite.append(("pp", entry["pages"]))
-        if "journal" in entry:
-            cite.append(("j", entry["journal"]))
-        if "volume" in entry:
-            cite.append(("v", entry["volume"]))
-        if "number" in entry:
-            cite.append(("n", entry["number"]))
-        if "doi" in entry:
-            cite.append(("doi", entry["doi"]))
-        if "annote" in entry:
-            cite.append(("an", entry["annote"]))
-        if "note" in entry:
-            cite.append(("nt", entry["note"]))
-
-        fdo.write(
-            """      <node COLOR="#ff33b8" TEXT="{}"/>\n""".format(
-                xml_escape(" ".join(["{}={}".format(*vals) for vals in cite]))
-            )
+        cite = " ".join(
+            f"{short}={entry[field]}" for short, field in CITE_FIELDS if field in entry
         )
+        out.append(f"""      <node COLOR="#ff33b8" TEXT="{xml_escape(cite)}"/>\n""")
 
         if "abstract" in entry:
-            fdo.write(
-                """      <node COLOR="#999999" \
-                TEXT="&quot;{}&quot;"/>\n""".format(xml_escape(entry["abstract"]))
+            abstract = xml_escape(entry["abstract"])
+            out.append(
+                f"""      <node COLOR="#999999" TEXT="&quot;{abstract}&quot;"/>\n"""
             )
 
-        fdo.write("""    </node>\n  </node>\n""")
+        out.append("""    </node>\n  </node>\n""")
+        fdo.write("".join(out))
 
     fdo.write("""</node>\n</map>\n""")
 
@@ -173,11 +169,9 @@ if __name__ == "__main__":
     for file_path in args.file_names:
         try:
             bibtex_content = file_path.read_text(encoding="utf-8", errors="replace")
-            file_out = file_path.with_suffix(".mm")
-            fdo = file_out.open("w")
         except OSError:
             print(f"{file_path=} does not exist")
             continue
-        entries = regex_parse(bibtex_content.split("\n"))
-        process(entries, fdo)
-        fdo.close()
+        entries = regex_parse(bibtex_content)
+        with file_path.with_suffix(".mm").open("w", encoding="utf-8") as fdo:
+            process(entries, fdo)
@@ -191,10 +191,10 @@ def remove_junk_hyphens(
 
     for match in matches:
         hyphenated_word = match[0] + match[1] + match[2]
-        log.debug(f"{hyphenated_word=}")
-        log.debug(f"{enchant_d.check(match[0])=}")
-        log.debug(f"{enchant_d.check(match[2])=}")
-        if not (enchant_d.check(match[0]) and enchant_d.check(match[2])):
+        is_first_word = enchant_d.check(match[0])
+        is_second_word = enchant_d.check(match[2])
+        log.debug(f"{hyphenated_word=} {is_first_word=} {is_second_word=}")
+        if not (is_first_word and is_second_word):
             replacement = match[0] + match[2]
             text = text.replace(hyphenated_word, replacement)
 
@@ -215,8 +215,9 @@ def restore_lost_spaces(text: str) -> str:
     checker.set_text(text)
     for error in checker:
         assert error.word is not None  # for typing
-        log.debug(f"{error.word}, {error.suggest()}")
-        for suggestion in error.suggest():
+        suggestions = error.suggest()
+        log.debug(f"{error.word}, {suggestions}")
+        for suggestion in suggestions:
             # Suggestion must be same as original with spaces removed
             if error.word.replace(" ", "") == suggestion.replace(" ", ""):
                 error.replace(suggestion)
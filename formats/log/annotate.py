@@ -19,10 +19,13 @@ from subprocess import call
 import config
 import thunderdell as td
 from biblio import fields as bf
-from biblio.keywords import KEY_SHORTCUTS
+from biblio.keywords import expand_tags
 from change_case import title_case
 
 NOW = time.localtime()
+CSL_CONTAINERS = frozenset(bf.CSL_SHORTCUTS.values())
+# short=value pairs; a value runs until the next short= or the end of line
+RE_CITE = re.compile(r"(\w{1,3})=(.*?)(?=\w{1,3}=|$)")
 
 
 def do_console_annotation(args, biblio):
@@ -65,8 +68,6 @@ def do_console_annotation(args, biblio):
         annotation_fn = config.TMP_DIR / "b-annotation.txt"
         if not resume_edit:
             rotate_files(annotation_fn)
-            if annotation_fn.exists():
-                annotation_fn.unlink()
             annotation_fn.write_text(initial_text, encoding="utf-8")
         call([config.EDITOR, str(annotation_fn)])
         return annotation_fn.read_text(encoding="utf-8").splitlines()
@@ -76,13 +77,15 @@ def do_console_annotation(args, biblio):
         # biblio['tags'] and whether to yasn publish are overwritten by
         # pre-populated and then edited console annotation
         biblio["tags"] = ""
+        keywords = []
         do_publish = False
         from_Instapaper = False  # are following lines Instapaper markdown?
-        console_annotations = ""
+        annotations = []
         biblio["comment"] = ""
 
         print(f"@{tentative_id}\n")
-        EQUAL_PAT = re.compile(r"(\w{1,3})=")
+        log.info(f"{bf.BIB_SHORTCUTS=}")
+        log.info(f"{bf.BIB_TYPES=}")
         for line in edited_text:
             log.info(f"{line=}")
             line = line.replace("\u200b", "")  # Instapaper export artifact
@@ -100,18 +103,14 @@ def do_console_annotation(args, biblio):
                 biblio["comment"] = line[2:].strip()
                 log.info(f"{biblio['comment']=}")
             elif "=" in line[0:3]:  # citation only if near start of line
-                cites = EQUAL_PAT.split(line)[1:]
-                # 2 refs to an iterable are '*' unpacked and rezipped
-                cite_pairs = list(zip(*[iter(cites)] * 2, strict=True))
+                cite_pairs = RE_CITE.findall(line)
                 log.info(f"{cite_pairs=}")
                 for short, value in cite_pairs:
-                    log.info(f"{bf.BIB_SHORTCUTS=}")
-                    log.info(f"{bf.BIB_TYPES=}")
                     log.info(f"short,value = {short},{value}")
                     # if short == "t":  # 't=phdthesis'
                     # biblio[bf.BIB_SHORTCUTS[value]] = biblio["c_web"]
                     if short == "kw":  # 'kw=complicity
-                        biblio["tags"] += " " + value.strip()
+                        keywords.append(value.strip())
                     else:
                         biblio[bf.BIB_SHORTCUTS[short]] = value.strip()
             else:
@@ -122,7 +121,9 @@ def do_console_annotation(args, biblio):
                         pass  # leave comments alone
                     else:
                         line = ", " + line  # prepend paraphrase mark
-                console_annotations += "\n\n" + line.strip()
+                annotations.append(line.strip())
+        biblio["tags"] = "".join(f" {keyword}" for keyword in keywords)
+        console_annotations = "".join(f"\n\n{line}" for line in annotations)
 
         log.info("biblio.get('excerpt', '') = '{}'".format(biblio.get("excerpt", "")))
         log.info(f"console_annotations = '{console_annotations}'")
@@ -130,11 +131,7 @@ def do_console_annotation(args, biblio):
             biblio["excerpt"] = console_annotations
 
         # See if there is a container/bf.CSL_SHORTCUTS redundant with 'c_web'
-        if (
-            "c_web" in biblio
-            and len([biblio[c] for c in list(bf.CSL_SHORTCUTS.values()) if c in biblio])
-            > 1
-        ):
+        if "c_web" in biblio and len(biblio.keys() & CSL_CONTAINERS) > 1:
             del biblio["c_web"]
         return biblio, do_publish
 
@@ -146,12 +143,7 @@ def do_console_annotation(args, biblio):
         if key.startswith("c_"):
             initial_text.append(f"{bf.CSL_FIELDS[key]}={title_case(biblio[key])}")
         if key == "tags" and biblio["tags"]:
-            tags = " ".join(
-                [
-                    "kw=" + KEY_SHORTCUTS.get(tag, tag)
-                    for tag in biblio["tags"].strip().split(" ")
-                ]
-            )
+            tags = " ".join(f"kw={tag}" for tag in expand_tags(biblio["tags"]))
             initial_text.append(tags)
     if args.publish:
         log.warning("appending -p to text")
@@ -12,7 +12,7 @@ __version__ = "1.0"
 import logging as log
 import time
 
-from biblio.keywords import KEY_SHORTCUTS
+from biblio.keywords import expand_tags
 from utils.web import yasn_publish
 
 NOW = time.localtime()
@@ -38,43 +38,26 @@ def log2console(args, biblio):
         "url",
     )
     log.info(f"biblio = '{biblio}'")
-    if biblio["tags"]:
-        tags = biblio["tags"].strip().split(" ")
-        tags_expanded = ""
-        for tag in tags:
-            tag = KEY_SHORTCUTS.get(tag, tag)
-            tags_expanded += tag + " "
-        # biblio['keywords'] = tags_expanded[0:-1]  # removes last space
-    bib_in_single_line = ""
+    fields = []
     for token in TOKENS:
-        log.info(f"token = '{token}'")
-        if token not in biblio:
-            if token == "url":  # I want these printed even if don't exist
-                biblio["url"] = ""
-            elif token == "title":
-                biblio["title"] = ""
-            elif token == "subtitle":
-                biblio["subtitle"] = ""
-        if biblio.get(token):
+        if value := biblio.get(token):
             if token == "tags":
-                for value in tags_expanded.strip().split(" "):
-                    # print('keyword = %s' % value)
-                    bib_in_single_line += f"keyword = {value} "
+                fields.extend(f"keyword = {tag}" for tag in expand_tags(value))
             else:
-                # print(('%s = %s' % (token, biblio[token])))
-                bib_in_single_line += f"{token} = {biblio[token]} "
-    print(f"{bib_in_single_line}")
+                fields.append(f"{token} = {value}")
+    bib_in_single_line = " ".join(fields)
+    print(bib_in_single_line)
     if "identifiers" in biblio:
-        for identifer, value in list(biblio["identifiers"].items()):
+        for identifer, value in biblio["identifiers"].items():
             if identifer.startswith("isbn"):
                 print(f"{identifer} = {value[0]}")
 
     if args.publish:
         yasn_publish(
             biblio["comment"],
-            biblio["title"],
-            biblio["subtitle"],
-            biblio["url"],
+            biblio.get("title", ""),
+            biblio.get("subtitle", ""),
+            biblio.get("url", ""),
             biblio["tags"],
         )
     return bib_in_single_line
@@ -17,6 +17,8 @@ from subprocess import Popen
 import config
 
 NOW = time.localtime()
+FILENAME_TABLE = str.maketrans({" ": "-", "'": None})
+RE_PHOTO = re.compile(r".*/photo/gallery/(\d\d\d\d/\d\d)/\d\d-\d\d\d\d-(.*)\.jpe?g")
 
 
 def log2goatee(args, biblio):
@@ -25,28 +27,30 @@ def log2goatee(args, biblio):
     log.info(f"{biblio['comment']=}")
     blog_title, sep, blog_body = biblio["comment"].partition(". ")
 
-    this_year, this_month, this_day = time.strftime("%Y %m %d", NOW).split()
+    this_date = time.strftime("%Y-%m-%d", NOW)
+    this_year, this_month, this_day = this_date.split("-")
     url = biblio.get("url", None)
     filename = blog_title.lower()
 
-    PHOTO_RE = re.compile(r".*/photo/gallery/(\d\d\d\d/\d\d)/\d\d-\d\d\d\d-(.*)\.jpe?g")
-    photo_match = False
+    photo_match = None
     if "goatee.net/photo/" in url:
-        photo_match = re.match(PHOTO_RE, url)
+        photo_match = RE_PHOTO.match(url)
         if photo_match:
-            blog_title = re.match(PHOTO_RE, url).group(2)
+            blog_title = photo_match.group(2)
             filename = blog_title
             blog_title = blog_title.replace("-", " ")
-    filename = filename.strip().replace(" ", "-").replace("'", "")
+    filename = filename.strip().translate(FILENAME_TABLE)
     filename = GOATEE_ROOT / f"{this_year}/{this_month}{this_day}-{filename}.md"
     log.info(f"{blog_title=}")
     log.info(f"{filename=}")
-    if filename.exists():
-        raise FileExistsError(f"\nfilename {filename} already exists")
-    with filename.open("w", encoding="utf-8", errors="replace") as fd:
+    try:
+        fd = filename.open("x", encoding="utf-8", errors="replace")
+    except FileExistsError as err:
+        raise FileExistsError(f"\nfilename {filename} already exists") from err
+    with fd:
         fd.write("---\n")
         fd.write(f"title: {blog_title}\n")
-        fd.write(f"date: {time.strftime('%Y-%m-%d', NOW)}\n")
+        fd.write(f"date: {this_date}\n")
         fd.write("tags: \n")
         fd.write("category: \n")
         fd.write("...\n\n")
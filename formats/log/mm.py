@@ -10,18 +10,86 @@ __version__ = "1.0"
 
 
 import logging as log
+import re
 import time
-from xml.etree.ElementTree import ElementTree, SubElement, parse  # Element,
+from xml.etree.ElementTree import Element, SubElement, tostring
+from xml.parsers import expat
 
 import config
 from biblio import fields as bf
-from biblio.keywords import KEY_SHORTCUTS
+from biblio.keywords import expand_tags
 from utils.web import yasn_publish
 
 from .annotate import do_console_annotation
 
 NOW = time.localtime()
 CURLY_TABLE = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+RE_EMPTY_TAG = re.compile(
+    rb"""<[\w-]+(?:\s+[^\s=/>]+\s*=\s*(?:"[^"]*"|'[^']*'))*\s*(/>)"""
+)
+
+
+def find_insertion_point(mm_bytes: bytes, year: str, week: str) -> tuple[int, int]:
+    """Find where a new entry goes in the mindmap's years/weeks hierarchy.
+
+    Return the byte offset of the end tag of the deepest existing node among
+    the years node (the map's first child), its `year` child, and that year's
+    `week` child; also return that depth (0-2) so the caller knows which nodes
+    it must create. An empty element's offset is that of its start tag.
+
+    >>> mm = b'<map><node><node TEXT="2023"><node TEXT="01"/></node></node></map>'
+    >>> find_insertion_point(mm, "2023", "01")
+    (29, 2)
+    >>> find_insertion_point(mm, "2023", "02")
+    (46, 1)
+    >>> find_insertion_point(mm, "2024", "01")
+    (53, 0)
+    """
+    return _InsertionPointFinder(mm_bytes, year, week).find()
+
+
+class _InsertionPointFinder:
+    """Track the years/weeks nodes as expat streams through a mindmap."""
+
+    def __init__(self, mm_bytes: bytes, year: str, week: str):
+        self.mm_bytes = mm_bytes
+        self.texts = (None, year, week)
+        self.found: list[int | None] = [None, None, None]  # end offset per depth
+        self.stack: list[tuple[int | None, int]] = []  # (depth if wanted, start)
+        self.root_children = 0
+        self.last_start = -1  # start offset of the element most recently opened
+        self.parser = expat.ParserCreate()
+        self.parser.StartElementHandler = self.start_element
+        self.parser.EndElementHandler = self.end_element
+
+    def find(self) -> tuple[int, int]:
+        self.parser.Parse(self.mm_bytes, True)
+        for depth in (2, 1, 0):
+            if (offset := self.found[depth]) is not None:
+                return offset, depth
+        raise RuntimeError("Sorry, mindmap has no years node.")
+
+    def start_element(self, tag: str, attrs: dict) -> None:
+        depth = None
+        if len(self.stack) == 1:
+            self.root_children += 1
+            if self.root_children == 1:
+                depth = 0
+        elif self.stack and (parent := self.stack[-1][0]) is not None and parent < 2:
+            child = parent + 1
+            if self.found[child] is None and attrs.get("TEXT") == self.texts[child]:
+                depth = child
+        self.last_start = self.parser.CurrentByteIndex
+        self.stack.append((depth, self.last_start))
+
+    def end_element(self, tag: str) -> None:
+        depth, start = self.stack.pop()
+        if depth is not None:
+            end = self.parser.CurrentByteIndex
+            # expat reports an empty element's end just past its "/>"
+            if start == self.last_start and self.mm_bytes[end - 2 : end] == b"/>":
+                end = start
+            self.found[depth] = end
 
 
 def log2mm(args, biblio):
@@ -50,47 +118,33 @@ def log2mm(args, biblio):
     for token in ["author", "title", "url", "permalink", "type"]:
         if token in biblio:  # not needed in citation
             del biblio[token]
-    citation = ""
-    for key, value in list(biblio.items()):
+    cites = []
+    for key, value in biblio.items():
         if key in bf.BIB_FIELDS:
             log.info(f"{key=} {value=}")
-            citation += f"{bf.BIB_FIELDS[key]}={value} "
-    citation += f" r={date_read} "
-    if biblio["tags"]:
-        tags = biblio["tags"]
-        for tag in tags.strip().split(" "):
-            keyword = KEY_SHORTCUTS.get(tag, tag)
-            citation += "kw=" + keyword + " "
-        citation = citation.strip()
-    else:
-        tags = ""
-
-    mindmap = parse(str(ofile)).getroot()
-    mm_years = mindmap[0]
-    for mm_year in mm_years:
-        if mm_year.get("TEXT") == this_year:
-            year_node = mm_year
-            break
-    else:
-        print(f"creating {this_year}")
-        year_node = SubElement(
-            mm_years, "node", {"TEXT": this_year, "POSITION": "right"}
-        )
-        week_node = SubElement(
-            year_node, "node", {"TEXT": this_week, "POSITION": "right"}
-        )
-
-    for week_node in year_node:
-        if week_node.get("TEXT") == this_week:
-            print(f"week {this_week}")
-            break
+            cites.append(f"{bf.BIB_FIELDS[key]}={value}")
+    cites.append(f"r={date_read}")
+    tags = biblio["tags"] or ""
+    cites.extend(f"kw={keyword}" for keyword in expand_tags(tags))
+    citation = " ".join(cites)
+
+    mm_bytes = ofile.read_bytes()
+    offset, depth = find_insertion_point(mm_bytes, this_year, this_week)
+    author_node = Element("node", {"TEXT": author, "STYLE_REF": "author"})
+    if depth == 2:
+        print(f"week {this_week}")
+        new_node = author_node
     else:
+        week_node = Element("node", {"TEXT": this_week, "POSITION": "right"})
+        week_node.append(author_node)
+        new_node = week_node
+        if depth == 0:
+            print(f"creating {this_year}")
+            year_node = Element("node", {"TEXT": this_year, "POSITION": "right"})
+            year_node.append(week_node)
+            new_node = year_node
         print(f"creating {this_week}")
-        week_node = SubElement(
-            year_node, "node", {"TEXT": this_week, "POSITION": "right"}
-        )
 
-    author_node = SubElement(week_node, "node", {"TEXT": author, "STYLE_REF": "author"})
     title_node = SubElement(
         author_node,
         "node",
@@ -142,7 +196,19 @@ def log2mm(args, biblio):
                 },
             )
 
-    ElementTree(mindmap).write(str(ofile), encoding="utf-8")
+    # Splice the new nodes in before the parent's end tag, writing only
+    # them and the rest of the file rather than reserializing the mindmap
+    new_bytes = tostring(new_node, encoding="unicode").encode("utf-8") + b"\n"
+    if mm_bytes.startswith(b"</", offset):
+        tail = mm_bytes[offset:]
+    else:  # parent is an empty element, e.g., <node TEXT="01"/>, so open it
+        offset = RE_EMPTY_TAG.match(mm_bytes, offset).start(1)  # type: ignore
+        new_bytes = b">\n" + new_bytes + b"</node>"
+        tail = mm_bytes[offset + 2 :]
+    with ofile.open("r+b") as fd:
+        fd.seek(offset)
+        fd.write(new_bytes + tail)
+        fd.truncate()
 
     if args.publish:
         log.info("YASN")
@@ -9,18 +9,20 @@ __license__ = "GLPv3"
 __version__ = "1.0"
 
 
-import re
+import shutil
 import time
 
 import config
 
 NOW = time.localtime()
+INSERTION_ANCHOR = '<dl style="clear: left;">'
 
 
 def log2nifty(args, biblio):
     """Log to personal blog."""
     print("to log2nifty\n")
-    ofile = config.HOME / "data/2web/goatee.net/nifty-stuff.html"
+    # resolved so a symlinked page is updated, not replaced
+    ofile = (config.HOME / "data/2web/goatee.net/nifty-stuff.html").resolve()
 
     title = biblio["title"]
     comment = biblio["comment"]
@@ -31,11 +33,13 @@ def log2nifty(args, biblio):
 
     content = ofile.read_text(encoding="utf-8")
 
-    INSERTION_RE = re.compile('(<dl style="clear: left;">)')
-    newcontent = INSERTION_RE.sub(
-        f"\\1 \n  {log_item}", content, re.DOTALL | re.IGNORECASE
-    )
-    if newcontent:
-        ofile.write_text(newcontent, encoding="utf-8")
-    else:
-        raise RuntimeError("Sorry, output regexp substitution failed.")
+    anchor_at = content.find(INSERTION_ANCHOR)
+    if anchor_at == -1:
+        raise RuntimeError("Sorry, nifty insertion anchor not found.")
+    insert_at = anchor_at + len(INSERTION_ANCHOR)
+    newcontent = f"{content[:insert_at]} \n  {log_item}{content[insert_at:]}"
+    # write aside and rename so an interrupted write can't truncate the page
+    tmp_file = ofile.with_suffix(".tmp")
+    tmp_file.write_text(newcontent, encoding="utf-8")
+    shutil.copymode(ofile, tmp_file)
+    tmp_file.replace(ofile)
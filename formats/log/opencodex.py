@@ -13,29 +13,27 @@ import time
 from subprocess import Popen
 
 import config
-from biblio.keywords import KEY_SHORTCUTS
+from biblio.keywords import expand_tags
 
 NOW = time.localtime()
+FILENAME_TABLE = str.maketrans({":": None, "'": None, " ": "-", "/": "-"})
 
 
 def log2opencodex(args, biblio):
     """Start at a blog entry at opencodex."""
     blog_title = blog_body = ""
     CODEX_ROOT = config.HOME / "data/2web/reagle.org/joseph/content/"
-    this_year, this_month, this_day = time.strftime("%Y %m %d", NOW).split()
+    this_date = time.strftime("%Y-%m-%d", NOW)
+    this_year = this_date[:4]
     blog_title = " ".join(biblio["title"].split(" ")[0:3])
     entry = biblio["comment"]
 
     category = "social"
     tags = ""
-    if biblio["tags"]:
-        tags = biblio["tags"].strip().split(" ")
-        category = KEY_SHORTCUTS.get(tags[0], tags[0])
-        tags_expanded = ""
-        for tag in tags:
-            tag = KEY_SHORTCUTS.get(tag, tag)
-            tags_expanded += tag + ","
-        tags = tags_expanded[0:-1]  # removes last comma
+    # whitespace-only tags expand to nothing, so keep the default category
+    if biblio["tags"] and (tags_expanded := expand_tags(biblio["tags"])):
+        category = tags_expanded[0]
+        tags = ",".join(tags_expanded)
 
     if entry:
         blog_title, sep, blog_body = entry.partition(".")
@@ -45,22 +43,17 @@ def log2opencodex(args, biblio):
         )
     log.info(f"blog_title='{blog_title}'")
 
-    filename = (
-        blog_title.lower()
-        .replace(":", "")
-        .replace(" ", "-")
-        .replace("'", "")
-        .replace("/", "-")
-    )
+    filename = blog_title.lower().translate(FILENAME_TABLE)
     filename = CODEX_ROOT / category / f"{this_year}-{filename}.md"
     log.info(f"{filename=}")
-    if filename.exists():
-        raise FileExistsError(f"\nfilename {filename} already exists")
-
-    with filename.open("w", encoding="utf-8", errors="replace") as fd:
+    try:  # create exclusively rather than check then open
+        fd = filename.open("x", encoding="utf-8", errors="replace")
+    except FileExistsError as err:
+        raise FileExistsError(f"\nfilename {filename} already exists") from err
+    with fd:
         fd.write("---\n")
         fd.write(f"title: {blog_title}\n")
-        fd.write(f"date: {time.strftime('%Y-%m-%d', NOW)}\n")
+        fd.write(f"date: {this_date}\n")
         fd.write(f"tags: {tags}\n")
         fd.write(f"category: {category}\n")
         fd.write("...\n\n")
@@ -9,70 +9,116 @@ __license__ = "GLPv3"
 __version__ = "1.0"
 
 
+import hashlib
 import logging as log
+import re
+import shutil
 import time
 import unicodedata
+from pathlib import Path
 
 from lxml import etree as l_etree
 
 import config
-from biblio.keywords import KEY_SHORTCUTS
+from biblio.keywords import hashify_tags
 from utils.web import escape_XML, yasn_publish
 
 NOW = time.localtime()
+# opening tag of the ul directly inside the Done div, however they are attributed
+RE_DONE_LIST = re.compile(
+    r"""<div\b[^>]*\sid=["']Done["'][^>]*>\s*<ul\b[^>]*>""", re.IGNORECASE
+)
+XPATH_DONE_LIST = l_etree.XPath("//div[@id='Done']/ul")
+
+
+def insert_log_item(plan_content: str, log_item: str) -> str | None:
+    r"""Splice log_item in as the first item of the Done list, if found.
+
+    A log_item that isn't well-formed is left to `insert_log_item_xml`.
+
+    >>> insert_log_item('<div id="Done"><ul>\n  <li>old</li></ul>', "<li>new</li>")
+    '<div id="Done"><ul>\n              <li>new</li>\n\n      <li>old</li></ul>'
+    >>> insert_log_item("<div class='x' id='Done'><ul class='y'></ul>", "<li>a</li>")
+    "<div class='x' id='Done'><ul class='y'>\n              <li>a</li>\n\n      </ul>"
+    >>> insert_log_item("<div><ul></ul></div>", "<li>new</li>") is None
+    True
+    >>> insert_log_item('<div id="Done"><p/></div><div><ul></ul>', "<li>a</li>") is None
+    True
+    >>> insert_log_item('<div data-id="Done"><ul></ul></div>', "<li>a</li>") is None
+    True
+    >>> insert_log_item('<div id="Done"><ul></ul></div>', "<li>a & b</li>") is None
+    True
+    """
+    try:
+        l_etree.XML(log_item)
+    except l_etree.XMLSyntaxError:
+        return None
+    if (list_match := RE_DONE_LIST.search(plan_content)) is None:
+        return None
+    insert_at = list_match.end()
+    return (
+        f"{plan_content[:insert_at]}\n              {log_item}\n\n      "
+        + plan_content[insert_at:].lstrip()
+    )
+
+
+def insert_log_item_xml(ofile: Path, log_item: str) -> str:
+    """Insert log_item into the Done list by parsing the plan as XML."""
+    plan_tree = l_etree.parse(
+        str(ofile), l_etree.XMLParser(ns_clean=True, recover=True)
+    )
+    ul_found = XPATH_DONE_LIST(plan_tree)
+    log.info(f"ul_found = {ul_found}")
+    if not ul_found:
+        raise RuntimeError("Sorry, not found: //x:div[@id='Done']/x:ul")
+    ul_found[0].text = "\n              "
+    try:  # lxml bug https://bugs.launchpad.net/lxml/+bug/1902364
+        log_item_xml = l_etree.XML(log_item)
+    except l_etree.XMLSyntaxError:
+        # if lxml chokes on unicode, convert to ascii
+        log_item_xml = l_etree.XML(
+            unicodedata.normalize("NFKD", log_item).encode("ascii", "ignore")
+        )
+    log_item_xml.tail = "\n\n      "
+    ul_found[0].insert(0, log_item_xml)
+    return l_etree.tostring(
+        plan_tree, pretty_print=True, encoding="unicode", method="xml"
+    )
 
 
 def log2work(args, biblio):
     """Log to work microblog."""
-    import hashlib
-
     print("to log2work\n")
     log.info(f"biblio = '{biblio}'")
-    ofile = config.HOME / "data/2web/reagle.org/joseph/plan/index.html"
+    # resolved so a symlinked plan is updated, not replaced
+    ofile = (config.HOME / "data/2web/reagle.org/joseph/plan/index.html").resolve()
     log.info(f"{ofile=}")
     subtitle = biblio["subtitle"].strip() if "subtitle" in biblio else ""
     title = biblio["title"].strip() + subtitle
     url = biblio["url"].strip()
     comment = biblio["comment"].strip() if biblio["comment"] else ""
-    if biblio["tags"]:
-        hashtags = ""
-        for tag in biblio["tags"].strip().split(" "):
-            hashtags += f"#{KEY_SHORTCUTS.get(tag, tag)} "
-        hashtags = hashtags.strip()
-    else:
-        hashtags = "#misc"
+    hashtags = hashify_tags(biblio["tags"]) if biblio["tags"] else "#misc"
     log.info(f"hashtags = '{hashtags}'")
     html_comment = f'{comment} <a href="{escape_XML(url)}">{escape_XML(title)}</a>'
     date_token = time.strftime("%y%m%d", NOW)
-    digest = hashlib.md5(html_comment.encode("utf-8", "replace")).hexdigest()
-    uid = "e" + date_token + "-" + digest[:5]
+    digest = hashlib.blake2b(
+        html_comment.encode("utf-8", "replace"), digest_size=3
+    ).hexdigest()
+    uid = f"e{date_token}-{digest[:5]}"
     log_item = (
         f'<li class="event" id="{uid}">{date_token}: {hashtags}] {html_comment}</li>'
     )
     log.info(f"{log_item=}")
 
-    plan_tree = l_etree.parse(
-        str(ofile), l_etree.XMLParser(ns_clean=True, recover=True)
-    )
-    ul_found = plan_tree.xpath("""//div[@id='Done']/ul""")
-    log.info(f"ul_found = {ul_found}")
-    if ul_found:
-        ul_found[0].text = "\n              "
-        try:  # lxml bug https://bugs.launchpad.net/lxml/+bug/1902364
-            log_item_xml = l_etree.XML(log_item)
-        except l_etree.XMLSyntaxError:
-            # if lxml chokes on unicode, convert to ascii
-            log_item_xml = l_etree.XML(
-                unicodedata.normalize("NFKD", log_item).encode("ascii", "ignore")
-            )
-        log_item_xml.tail = "\n\n      "
-        ul_found[0].insert(0, log_item_xml)
-        new_content = l_etree.tostring(
-            plan_tree, pretty_print=True, encoding="unicode", method="xml"
-        )
-        ofile.write_text(new_content, encoding="utf-8")
-    else:
-        raise RuntimeError("Sorry, not found: //x:div[@id='Done']/x:ul")
+    plan_content = ofile.read_text(encoding="utf-8")
+    new_content = insert_log_item(plan_content, log_item)
+    if new_content is None:
+        new_content = insert_log_item_xml(ofile, log_item)
+    # write aside and rename so an interrupted write can't truncate the plan
+    tmp_file = ofile.with_suffix(".tmp")
+    tmp_file.write_text(new_content, encoding="utf-8")
+    shutil.copymode(ofile, tmp_file)
+    tmp_file.replace(ofile)
 
     if args.publish:
         yasn_publish(comment, title, subtitle, url, hashtags)
@@ -13,9 +13,13 @@ import logging as log
 
 import doi_query
 from change_case import sentence_case
+from utils.dates import format_date_parts
 
 from .default import ScrapeDefault
 
+# CSL JSON keys that are named differently in a biblio
+DOI_FIELDS = {"page": "pages", "container-title": "journal", "issue": "number"}
+
 
 class ScrapeDOI(ScrapeDefault):
     def __init__(self, url, comment):
@@ -32,7 +36,7 @@ class ScrapeDOI(ScrapeDefault):
             "excerpt": "",
             "comment": self.comment,
         }
-        for key, value in list(json_bib.items()):
+        for key, value in json_bib.items():
             log.info(f"{key=} {value=} {type(value)=}")
             if value in (None, [], ""):
                 pass
@@ -40,16 +44,10 @@ class ScrapeDOI(ScrapeDefault):
                 biblio["author"] = self.get_author(json_bib)
             elif key == "issued":
                 biblio["date"] = self.get_date(json_bib)
-            elif key == "page":
-                biblio["pages"] = json_bib["page"]
-            elif key == "container-title":
-                biblio["journal"] = json_bib["container-title"]
-            elif key == "issue":
-                biblio["number"] = json_bib["issue"]
             elif key == "URL":
-                biblio["permalink"] = biblio["url"] = json_bib["URL"]
+                biblio["permalink"] = biblio["url"] = value
             else:
-                biblio[key] = json_bib[key]
+                biblio[DOI_FIELDS.get(key, key)] = value
         if "title" not in json_bib:
             biblio["title"] = "UNKNOWN"
         else:
@@ -60,7 +58,7 @@ class ScrapeDOI(ScrapeDefault):
     def get_author(self, bib_dict):
         names = "UNKNOWN"
         if "author" in bib_dict:
-            names = ""
+            joined_names = []
             for name_dic in bib_dict["author"]:
                 log.info(f"name_dic = '{name_dic}'")
                 if "literal" in name_dic:
@@ -69,23 +67,14 @@ class ScrapeDOI(ScrapeDefault):
                 else:
                     joined_name = f"{name_dic['given']} {name_dic['family']}"
                 log.info(f"joined_name = '{joined_name}'")
-                names = names + ", " + joined_name
-            names = names[2:]  # remove first comma
+                joined_names.append(joined_name)
+            names = ", ".join(joined_names)
         return names
 
     def get_date(self, bib_dict):
         # "issued":{"date-parts":[[2007,3]]}
         date_parts = bib_dict["issued"]["date-parts"][0]
         log.info(f"{date_parts=}")
-        if len(date_parts) == 3:
-            year, month, day = date_parts
-            date = "%d%02d%02d" % (int(year), int(month), int(day))
-        elif len(date_parts) == 2:
-            year, month = date_parts
-            date = "%d%02d" % (int(year), int(month))
-        elif len(date_parts) == 1:
-            date = str(date_parts[0])
-        else:
-            date = "0000"
+        date = format_date_parts(date_parts)
         log.info(f"{date=}")
         return date
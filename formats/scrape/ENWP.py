@@ -13,12 +13,17 @@ import logging as log
 import re
 import time
 
+from lxml import etree
+
 from biblio import fields as bf
-from utils.web import get_HTML, unescape_entities
+from utils.web import get_HTML_cached, unescape_entities
 
-from .default import ScrapeDefault
+from .default import ScrapeDefault, memoize
 
 NOW = time.localtime()
+XPATH_PERMALINK = etree.XPath("""//li[@id="t-permalink"]/a/@href""")
+XPATH_REVISION_DATE = etree.XPath("""string(//span[@id="mw-revision-date"])""")
+RE_REVISION_DATE = re.compile(r"(\d{1,2}) (\w+) (\d\d\d\d)")
 
 
 class ScrapeENWP(ScrapeDefault):
@@ -37,24 +42,20 @@ class ScrapeENWP(ScrapeDefault):
         log.info(f"title = '{title}'")
         return title.replace(" - Wikipedia", "")
 
+    @memoize
     def get_permalink(self):
         if "oldid" not in self.url and "=Special:" not in self.url:
-            permalink = self.url.split("/wiki/")[0] + re.search(
-                '''<li id="t-permalink".*?><a href="(.*?)"''', self.html_u
-            ).group(1)
-            return unescape_entities(permalink)
-        else:
-            return self.url
+            url_host = self.url.split("/wiki/")[0]
+            url_path = XPATH_PERMALINK(self.html_p)[0]
+            return unescape_entities(url_host + url_path)
+        return self.url
 
     def get_date(self):
         """Find date within span."""
         if "oldid" not in self.url and "=Special:" not in self.url:
-            _, _, versioned_HTML_u, resp = get_HTML(self.get_permalink())
-            _, day, month, year = re.search(
-                r"""<span id="mw-revision-date">(.*?), (\d{1,2}) (\w+) """
-                r"""(\d\d\d\d)</span>""",
-                versioned_HTML_u,
-            ).groups()
+            _, versioned_HTML_p, _, _ = get_HTML_cached(self.get_permalink())
+            revision_date = XPATH_REVISION_DATE(versioned_HTML_p)
+            day, month, year = RE_REVISION_DATE.search(revision_date).groups()
             month = bf.MONTH2DIGIT[month[0:3].lower()]
             return "%d%02d%02d" % (int(year), int(month), int(day))
         else:
@@ -12,9 +12,13 @@ __version__ = "1.0"
 import logging as log
 
 from change_case import sentence_case
+from utils.dates import format_date_parts
 
 from .default import ScrapeDefault
 
+# isbn_query keys that are named differently in a biblio
+ISBN_FIELDS = {"year": "date", "pageCount": "pages", "city": "address"}
+
 
 class ScrapeISBN(ScrapeDefault):
     def __init__(self, url, comment):
@@ -34,7 +38,7 @@ class ScrapeISBN(ScrapeDefault):
             "comment": self.comment,
         }
         log.info("### json_bib.items()")
-        for key, value in list(json_bib.items()):
+        for key, value in json_bib.items():
             log.info(f"key = '{key}'")
             if key.startswith("subject"):
                 continue
@@ -43,21 +47,10 @@ class ScrapeISBN(ScrapeDefault):
                 pass
             elif key == "author":
                 biblio["author"] = self.get_author(json_bib)
-            elif key == "year":
-                biblio["date"] = json_bib["year"]
-            elif key == "isbn":
-                biblio["isbn"] = json_bib["isbn"]
-            elif key == "pageCount":
-                biblio["pages"] = json_bib["pageCount"]
-            elif key == "publisher":
-                biblio["publisher"] = json_bib["publisher"]
-            elif key == "city":
-                biblio["address"] = json_bib["city"]
             elif key == "url":
-                biblio["url"] = json_bib["url"]
-                biblio["permalink"] = json_bib["url"]
+                biblio["permalink"] = biblio["url"] = value
             else:
-                biblio[key] = json_bib[key]
+                biblio[ISBN_FIELDS.get(key, key)] = value
         if "title" in json_bib:
             title = biblio["title"].replace(": ", ": ")
             biblio["title"] = sentence_case(title)
@@ -78,15 +71,6 @@ class ScrapeISBN(ScrapeDefault):
         # "issued":{"date-parts":[[2007,3]]}
         date_parts = bib_dict["issued"]["date-parts"][0]
         log.info(f"{date_parts=}")
-        if len(date_parts) == 3:
-            year, month, day = date_parts
-            date = "%d%02d%02d" % (int(year), int(month), int(day))
-        elif len(date_parts) == 2:
-            year, month = date_parts
-            date = "%d%02d" % (int(year), int(month))
-        elif len(date_parts) == 1:
-            date = str(date_parts[0])
-        else:
-            date = "0000"
+        date = format_date_parts(date_parts)
         log.info(f"{date=}")
         return date
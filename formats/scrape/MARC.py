@@ -10,49 +10,62 @@ __version__ = "1.0"
 
 
 import re
-import time
 
-from .default import ScrapeDefault
+from .default import ScrapeDefault, memoize
+
+MARC_FIELDS = ("List", "Subject", "From", "Date")
+RE_MARC_HEADER = re.compile(r"\b(List|Subject|From|Date): *(.*)")
+RE_MARC_LINK = re.compile(r"""<a href=".*?">(.*?)</a>""")
+# MARC obscures addresses, e.g., "joe () example ! com &lt;...&gt;"
+MARC_AUTHOR_SUBS = {" () ": "@", " ! ": ".", "&lt;": "<", "&gt;": ">"}
+RE_MARC_AUTHOR_SUBS = re.compile("|".join(map(re.escape, MARC_AUTHOR_SUBS)))
+RE_MARC_DATE = re.compile(r"(\d{4})-(\d\d)-(\d\d) ")
+
+
+def get_link_text(value: str) -> str:
+    """Return the text of a value that is a link, else the value itself.
+
+    >>> get_link_text('<a href="?l=wikipedia-l">wikipedia-l</a>')
+    'wikipedia-l'
+    >>> get_link_text("Jimmy Wales <jwales () bomis ! com>")
+    'Jimmy Wales <jwales () bomis ! com>'
+    """
+    if link_match := RE_MARC_LINK.match(value):
+        return link_match.group(1)
+    return value
 
 
 class ScrapeMARC(ScrapeDefault):
     def __init__(self, url, comment):
         print("Scraping MARC;", end="\n")
         ScrapeDefault.__init__(self, url, comment)
+        # Collect the message's header fields in a single pass
+        self.header = {}
+        for field_match in RE_MARC_HEADER.finditer(self.html_u or ""):
+            self.header.setdefault(field_match.group(1), field_match.group(2))
+            if len(self.header) == len(MARC_FIELDS):
+                break
 
     def get_author(self):
-        try:
-            author = re.search("""From: *<a href=".*?">(.*?)</a>""", self.html_u)
-        except AttributeError:
-            author = re.search("""From: *(.*)""", self.html_u)
-        author = author.group(1)
-        author = (
-            author.replace(" () ", "@")
-            .replace(" ! ", ".")
-            .replace("&lt;", "<")
-            .replace("&gt;", ">")
+        author = get_link_text(self.header["From"])
+        author = RE_MARC_AUTHOR_SUBS.sub(
+            lambda match: MARC_AUTHOR_SUBS[match.group()], author
         )
-        author = author.split(" <")[0]
-        author = author.replace('"', "")
-        return author
+        return author.split(" <", 1)[0].replace('"', "")
 
+    @memoize
     def get_title(self):
-        subject = re.search("""Subject: *(.*)""", self.html_u).group(1)
-        if subject.startswith("<a href"):
-            subject = re.search("""<a href=".*?">(.*?)</a>""", subject).group(1)
+        subject = get_link_text(self.header["Subject"])
         subject = subject.replace("[Wikipedia-l] ", "").replace("[WikiEN-l] ", "")
         return subject
 
     def get_date(self):
-        mdate = re.search("""Date: *<a href=".*?">(.*?)</a>""", self.html_u).group(1)
-        try:
-            date = time.strptime(mdate, "%Y-%m-%d %I:%M:%S")
-        except ValueError:
-            date = time.strptime(mdate, "%Y-%m-%d %H:%M:%S")
-        return time.strftime("%Y%m%d", date)
+        mdate = get_link_text(self.header["Date"])  # e.g., "2009-01-31 13:05:00"
+        return "".join(RE_MARC_DATE.match(mdate).groups())
 
+    @memoize
     def get_org(self):
-        return re.search("""List: *<a href=".*?">(.*?)</a>""", self.html_u).group(1)
+        return get_link_text(self.header["List"])
 
     def get_excerpt(self):
         excerpt = ""
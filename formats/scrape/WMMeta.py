@@ -11,10 +11,20 @@ __version__ = "1.0"
 
 import re
 
+from lxml import etree
+
 from biblio import fields as bf
-from utils.web import get_HTML, unescape_entities
+from utils.web import get_HTML_cached, unescape_entities
+
+from .default import ScrapeDefault, memoize
 
-from .default import ScrapeDefault
+XPATH_PERMALINK = etree.XPath("""//li[@id="t-permalink"]/a/@href""")
+XPATH_LAST_MODIFIED = etree.XPath("""string(//li[@id="footer-info-lastmod"])""")
+RE_LAST_EDITED = re.compile(r"last edited on (\d{1,2}) (\w+) (\d\d\d\d)")
+RE_FOOTER_LAST_EDITED = re.compile(
+    r"""<li id="footer-info-lastmod"> This page was last edited """
+    + r"""on (\d{1,2}) (\w+) (\d\d\d\d)"""
+)
 
 
 class ScrapeWMMeta(ScrapeDefault):
@@ -30,22 +40,15 @@ class ScrapeWMMeta(ScrapeDefault):
         return title.replace(" - Meta", "")
 
     def get_date(self):  # Meta is often foobar because of proxy bugs
-        day, month, year = re.search(
-            r"""<li id="footer-info-lastmod"> This page was last edited """
-            + r"""on (\d{1,2}) (\w+) (\d\d\d\d)""",
-            self.html_u,
-        ).groups()
+        last_edited = XPATH_LAST_MODIFIED(self.html_p)
+        day, month, year = RE_LAST_EDITED.search(last_edited).groups()
         month = bf.MONTH2DIGIT[month[0:3].lower()]
         return "%d%02d%02d" % (int(year), int(month), int(day))
 
     def get_date_old(self):  # Meta is often foobar because of proxy bugs
-        _, _, cite_HTML_u, resp = get_HTML(self.get_permalink())
+        _, _, cite_HTML_u, resp = get_HTML_cached(self.get_permalink())
         # in browser, id="lastmod", but python gets id="footer-info-lastmod"
-        day, month, year = re.search(
-            r"""<li id="footer-info-lastmod"> This page was last edited """
-            + r"""on (\d{1,2}) (\w+) (\d\d\d\d)""",
-            cite_HTML_u,
-        ).groups()
+        day, month, year = RE_FOOTER_LAST_EDITED.search(cite_HTML_u).groups()
         month = bf.MONTH2DIGIT[month[0:3].lower()]
         return "%d%02d%02d" % (int(year), int(month), int(day))
 
@@ -55,8 +58,8 @@ class ScrapeWMMeta(ScrapeDefault):
     def get_excerpt(self):
         return ""  # no good way to identify first paragraph at Meta
 
+    @memoize
     def get_permalink(self):
         url_host = self.url.split("/wiki/")[0]
-        url_path = self.html_p.xpath("""//li[@id="t-permalink"]/a/@href""")[0]
-        permalink = url_host + url_path
-        return unescape_entities(permalink)
+        url_path = XPATH_PERMALINK(self.html_p)[0]
+        return unescape_entities(url_host + url_path)
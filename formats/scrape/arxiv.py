@@ -42,7 +42,7 @@ class ScrapeArXiv(ScrapeDefault):
             "identifier": self.identifier,
             "comment": self.comment,
         }
-        for key, value in list(dict_bib.items()):
+        for key, value in dict_bib.items():
             log.info(f"{key=} {value=} {type(value)=}")
             if value in (None, [], ""):
                 pass
@@ -51,9 +51,9 @@ class ScrapeArXiv(ScrapeDefault):
             elif key == "published":
                 biblio["date"] = self.get_date(dict_bib)
             elif key == "URL":
-                biblio["permalink"] = biblio["url"] = dict_bib["URL"]
+                biblio["permalink"] = biblio["url"] = value
             else:
-                biblio[key] = dict_bib[key]
+                biblio[key] = value
         if "title" not in dict_bib:
             biblio["title"] = "UNKNOWN"
         else:
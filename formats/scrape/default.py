@@ -10,13 +10,13 @@ __version__ = "1.0"
 
 
 import datetime
+import functools
 import logging as log
 import re
-import string
 import time
 from urllib.parse import urlparse
 
-import datefinder  # https://github.com/akoumjian/datefinder
+from lxml import etree
 
 from biblio.fields import SITE_CONTAINER_MAP
 from change_case import sentence_case
@@ -27,6 +27,88 @@ from utils.web import get_HTML, get_text, unescape_entities
 NOW = time.localtime()
 MONTHS = "jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec"
 
+# Author heuristics as one alternation, in order of preference, so the text
+# is scanned once; the name of the group that matched identifies the heuristic.
+# The first may absorb the others' prefixes so they can't hide its matches.
+RE_AUTHOR = re.compile(
+    r"(?:^\W*(?:posted )?|\s{3,})?by (?P<by_date>[a-z ]*?)(?:-|, |/ | at | on | posted ).{,35}?\d\d\d\d"
+    r"|^\W*(?:posted )?by[:]? (?P<by_line>.*)"
+    r"|\d\d\d\d.{,6}? by (?P<date_by>[a-z ]*)"
+    r"|\s{3,}by[:]? (?P<spaced_by>.*)",
+    re.IGNORECASE | re.MULTILINE,
+)
+# Author metadata (attribute, value) in order of preference; all are fetched
+# with one query. Sadly, lxml doesn't support xpath 2.0 and lower-case()
+META_AUTHOR_KEYS = (
+    ("name", "DC.Contributor"),
+    ("name", "author"),
+    ("name", "Author"),
+    ("name", "AUTHOR"),
+    ("name", "authors"),
+    ("http-equiv", "author"),
+    ("name", "sailthru.author"),
+)
+XPATH_META_AUTHORS = etree.XPath(
+    "//meta[{}]".format(
+        " or ".join(f"@{attr}='{value}'" for attr, value in META_AUTHOR_KEYS)
+    )
+)
+AUTHOR_XPATHS = tuple(
+    etree.XPath(path)
+    for path in (
+        """//a[@rel='author']//text()""",
+        """//span[@class='author']/text()""",  # WashingtonPost
+        """//*[@itemprop='author']//text()""",  # engadget
+        """//*[contains(@class,'contributor')]/text()""",
+        """//span[@class='name']/text()""",
+        # tynan w/ bogus space
+        """(//span[@class='dynamic-display_name-user-1 '])[1]/text()""",
+        # amazon
+        """//a[contains(@href, 'cm_cr_hreview_mr')]/text()""",
+        # first of many
+        """//*[1][contains(@class, 'byline')][1]//text()""",
+    )
+)
+DATE_XPATHS = tuple(
+    etree.XPath(path)
+    for path in (
+        """//meta[@name="date"]/@content""",
+        """//meta[@name="pubdate"]/@content""",
+        """//meta[@property="article:published_time"]/@content""",
+        """//li/span[@class="byline_label"]/following-sibling::span/@title""",
+        """//relative-time/@datetime""",
+    )
+)
+# Title patterns by host
+TITLE_REGEXPS = {
+    host: re.compile(regexp, re.DOTALL | re.IGNORECASE)
+    for host, regexp in {
+        "lists.w3.org": '<!-- subject="(.*?)" -->',
+        "lists.kde.org": r"<title>MARC: msg '(.*?)'</title>",
+        "www.youtube.com": r'''"title":"(.*?)"''',
+        "DEFAULT": r"<title[^>]*>([^<]+)</title>",
+    }.items()
+}
+# Delimiters between a page's title and its site's name
+RE_STRONG_DELIMITERS = re.compile(r"\s[\|—«»]\s")
+RE_WEAK_DELIMITERS = re.compile(r"[:;-]\s")
+RE_ORG_WORDS = re.compile(r"blog|lab|center", re.IGNORECASE)
+# Site containers keyed by domain, plus the few matched anywhere in the URL
+SITE_CONTAINERS_BY_DOMAIN = {
+    site: (container, container_type)
+    for site, container, container_type in SITE_CONTAINER_MAP
+    if "." in site
+}
+SITE_CONTAINERS_BY_SUBSTRING = tuple(
+    (site, (container, container_type))
+    for site, container, container_type in SITE_CONTAINER_MAP
+    if "." not in site
+)
+# Lines that might still be long enough for an excerpt once whitespace is squeezed
+RE_LONG_LINE = re.compile(r"^.{250,}$", re.MULTILINE)
+XPATH_LONG_PARAGRAPHS = etree.XPath("//p[string-length(normalize-space()) >= 250]")
+XPATH_NORMALIZED_TEXT = etree.XPath("normalize-space()")
+
 
 def winnow_dates(self) -> datetime.datetime:
     """Validate and sanity check results from datefinder.
@@ -35,6 +117,8 @@ def winnow_dates(self) -> datetime.datetime:
     - in the future
     - older than 50 years.
     """
+    import datefinder  # https://github.com/akoumjian/datefinder; slow to import
+
     now = datetime.datetime.now()
     fifty_years_ago = now - datetime.timedelta(days=50 * 365.25)
     winnowed_dates = []
@@ -45,6 +129,104 @@ def winnow_dates(self) -> datetime.datetime:
     return winnowed_dates[0]
 
 
+def title_author(name: str) -> str:
+    """Title-case a name if it is all lower or upper case; else leave it alone.
+
+    >>> title_author("joseph  reagle")
+    'Joseph Reagle'
+    >>> title_author("JOSEPH REAGLE")
+    'Joseph Reagle'
+    >>> title_author("Ian McDonald")
+    'Ian McDonald'
+    """
+    name = " ".join(name.split())
+    if name.islower() or name.isupper():
+        return name.title()
+    return name
+
+
+def get_site_container(url: str) -> tuple[str, str] | None:
+    """Return the (container, container_type) of a well-known site, if any.
+
+    >>> get_site_container("https://www.nytimes.com/2021/07/01/x.html")
+    ('The New York Times', 'c_newspaper')
+    >>> get_site_container("https://en.wikipedia.org/wiki/Wikipedia_Signpost/2021")
+    ('Wikipedia Signpost', 'c_web')
+    >>> get_site_container("https://example.com/nytimes.com") is None
+    True
+    """
+    labels = urlparse(url).netloc.lower().split(".")
+    for start in range(len(labels) - 1):
+        if site_container := SITE_CONTAINERS_BY_DOMAIN.get(".".join(labels[start:])):
+            return site_container
+    for site, site_container in SITE_CONTAINERS_BY_SUBSTRING:
+        if site in url:
+            return site_container
+    return None
+
+
+def memoize(method):
+    """Cache a no-argument scraper method's result on the instance."""
+    cache_attr = f"_{method.__name__}"
+
+    @functools.wraps(method)
+    def wrapper(self):
+        if cache_attr not in self.__dict__:
+            self.__dict__[cache_attr] = method(self)
+        return self.__dict__[cache_attr]
+
+    return wrapper
+
+
+def is_plausible_author(author: str) -> bool:
+    """Test if a matched byline is of a plausible length for its names.
+
+    >>> is_plausible_author("Joe")
+    False
+    >>> is_plausible_author("Joseph Reagle")
+    True
+    >>> is_plausible_author("Joseph Reagle and a long list of contributors")
+    True
+    >>> is_plausible_author("Joseph Reagle in a long run on sentence, as here")
+    False
+    """
+    author_lc = author.lower()
+    max_length = 30
+    if " and " in author_lc:
+        max_length += 35
+        if ", " in author_lc:
+            max_length += 35
+    return 4 < len(author) < max_length
+
+
+def author_from_text(text: str) -> str | None:
+    r"""Guess the author from a page's bylines, trying heuristics in turn.
+
+    Only each heuristic's first match in the text is considered.
+
+    >>> author_from_text("Posted by admin\nSome intro\nStory by jane doe, March 3 2021")
+    'Jane Doe'
+    >>> author_from_text("published 2020 by the editors of this site\nby mary jones, 2019")
+    'Mary Jones'
+    >>> author_from_text("Posted by joe") is None
+    True
+    """
+    log.info("checking author regex")
+    first_matches: dict[str, re.Match] = {}
+    for dmatch in RE_AUTHOR.finditer(text):
+        first_matches.setdefault(dmatch.lastgroup, dmatch)
+    for heuristic in RE_AUTHOR.groupindex:
+        if (dmatch := first_matches.get(heuristic)) is None:
+            continue
+        log.info(f'matched: "{heuristic}"')
+        author = dmatch.group(heuristic).strip()
+        log.info(f"author = '{dmatch.group()}'")
+        if is_plausible_author(author):
+            return title_author(author)
+        log.info(f"length {len(author)} is implausible")
+    return None
+
+
 class ScrapeDefault:
     """Default and base class scraper."""
 
@@ -65,8 +247,8 @@ class ScrapeDefault:
             )
 
         self.text = None
-        if self.html_b:
-            self.text = get_text(url)
+        if self.html_p is not None:
+            self.text = get_text(self.html_p)
 
     def get_biblio(self):
         biblio = {
@@ -78,101 +260,67 @@ class ScrapeDefault:
             "url": self.url,
         }
         biblio["title"], biblio["c_web"] = self.split_title_org()
-        for site, container, container_type in SITE_CONTAINER_MAP:
-            if site in biblio["url"]:
-                log.info(f"{container=}")
-                biblio[container_type] = container
-                del biblio["c_web"]
+        if site_container := get_site_container(biblio["url"]):
+            container, container_type = site_container
+            log.info(f"{container=}")
+            del biblio["c_web"]
+            biblio[container_type] = container
         return biblio
 
+    @memoize
+    def get_url_parts(self):
+        """Return the parsed URL, parsed once per scraper."""
+        return urlparse(self.url)
+
+    def iter_author_xpaths(self):
+        """Yield (description, result) of author xpaths in order of preference."""
+        meta_contents = {}
+        for meta in XPATH_META_AUTHORS(self.html_p):
+            if (content := meta.get("content")) is not None:
+                for attr, value in META_AUTHOR_KEYS:
+                    if meta.get(attr) == value:
+                        meta_contents.setdefault((attr, value), []).append(content)
+        for key in META_AUTHOR_KEYS:
+            if key in meta_contents:
+                yield f"meta[@{key[0]}='{key[1]}']", meta_contents[key]
+        for path in AUTHOR_XPATHS:
+            log.info(f"trying = '{path.path}'")
+            yield path.path, path(self.html_p)
+
     def get_author(self):
         """Return guess of article author."""
-        # sadly, lxml doesn't support xpath 2.0 and lower-case()
-        AUTHOR_XPATHS = (
-            """//meta[@name='DC.Contributor']/@content""",
-            """//meta[@name='author']/@content""",
-            """//meta[@name='Author']/@content""",
-            """//meta[@name='AUTHOR']/@content""",
-            """//meta[@name='authors']/@content""",
-            """//meta[@http-equiv='author']/@content""",
-            """//meta[@name='sailthru.author']/@content""",
-            """//a[@rel='author']//text()""",
-            """//span[@class='author']/text()""",  # WashingtonPost
-            """//*[@itemprop='author']//text()""",  # engadget
-            """//*[contains(@class,'contributor')]/text()""",
-            """//span[@class='name']/text()""",
-            # tynan w/ bogus space
-            """(//span[@class='dynamic-display_name-user-1 '])[1]/text()""",
-            # amazon
-            """//a[contains(@href, 'cm_cr_hreview_mr')]/text()""",
-            # first of many
-            """//*[1][contains(@class, 'byline')][1]//text()""",
-        )
         if self.html_p is not None:
             log.info("checking author xpaths")
-            for path in AUTHOR_XPATHS:
-                log.info(f"trying = '{path}'")
-                xpath_result = self.html_p.xpath(path)
+            for path, xpath_result in self.iter_author_xpaths():
                 if xpath_result:
                     log.info(f"{xpath_result=}; {path=}")
-                    author = string.capwords(" ".join(xpath_result).strip())
-                    if author.lower().startswith("by "):
+                    author = " ".join(xpath_result).strip()
+                    if author[:3].lower() == "by ":
                         author = author[3:]
-                    author = author.replace(" And ", ", ")
+                    author = title_author(author)
+                    author = author.replace(" and ", ", ").replace(" And ", ", ")
                     log.info(f"{author=}; {path=}")
                     if author != "":
                         return author
                     else:
                         continue
 
-        if self.text:
-            AUTHOR_REGEXS = (
-                r"by ([a-z ]*?)(?:-|, |/ | at | on | posted ).{,35}?\d\d\d\d",
-                r"^\W*(?:posted )?by[:]? (.*)",
-                r"\d\d\d\d.{,6}? by ([a-z ]*)",
-                r"\s{3,}by[:]? (.*)",
-            )
-            # info(self.text)
-            log.info("checking regexs")
-            for regex in AUTHOR_REGEXS:
-                log.info(f"trying = '{regex}'")
-                dmatch = re.search(regex, self.text, re.IGNORECASE | re.MULTILINE)
-                if dmatch:
-                    log.info(f'matched: "{regex}"')
-                    author = dmatch.group(1).strip()
-                    MAX_MATCH = 30
-                    if " and " in author:
-                        MAX_MATCH += 35
-                        if ", " in author:
-                            MAX_MATCH += 35
-                    log.info(f"author = '{dmatch.group()}'")
-                    if len(author) > 4 and len(author) < MAX_MATCH:
-                        return string.capwords(author)
-                    else:
-                        log.info(f"length {len(author)} is <4 or > {MAX_MATCH}")
-                else:
-                    log.info(f'failed: "{regex}"')
+        if self.text and (author := author_from_text(self.text)):
+            return author
 
         return "UNKNOWN"
 
     def get_date(self):
         """Return date from xpath, guess from datefinder, or today's date."""
-        DATE_XPATHS = (
-            """//meta[@name="date"]/@content""",
-            """//meta[@name="pubdate"]/@content""",
-            """//meta[@property="article:published_time"]/@content""",
-            """//li/span[@class="byline_label"]/following-sibling::span/@title""",
-            """//relative-time/@datetime""",
-        )
         if self.html_p is not None:
             log.info("checking date xpaths")
             for path in DATE_XPATHS:
-                log.info(f"trying = '{path}'")
-                xpath_result = self.html_p.xpath(path)
+                log.info(f"trying = '{path.path}'")
+                xpath_result = path(self.html_p)
                 if xpath_result:
-                    log.info(f"'{xpath_result=}'; '{path=}'")
+                    log.info(f"'{xpath_result=}'; '{path.path=}'")
                     date = parse_date(xpath_result[0])
-                    log.info(f"date = '{date}'; xpath = '{path}'")
+                    log.info(f"date = '{date}'; xpath = '{path.path}'")
                     if date != "":
                         return date
                     else:
@@ -185,19 +333,13 @@ class ScrapeDefault:
             log.info(f"date not found returning default NOW: {e}")
         return date
 
+    @memoize
     def get_title(self):
-        url_title_regexps = {
-            "lists.w3.org": '<!-- subject="(.*?)" -->',
-            "lists.kde.org": r"<title>MARC: msg '(.*?)'</title>",
-            "www.youtube.com": r'''"title":"(.*?)"''',
-            "DEFAULT": r"<title[^>]*>([^<]+)</title>",
-        }
-
-        url = urlparse(self.url)
-        title_regexp = url_title_regexps.get(url.netloc, url_title_regexps["DEFAULT"])
+        netloc = self.get_url_parts().netloc
+        title_regexp = TITLE_REGEXPS.get(netloc, TITLE_REGEXPS["DEFAULT"])
         title = "UNKNOWN TITLE"
         if self.html_u:
-            tmatch = re.search(title_regexp, self.html_u, re.DOTALL | re.IGNORECASE)
+            tmatch = title_regexp.search(self.html_u)
             if tmatch:
                 title = tmatch.group(1).strip()
                 title = unescape_entities(title)
@@ -205,36 +347,34 @@ class ScrapeDefault:
                 title = smart_to_markdown(title)
         return title
 
+    @memoize
     def split_title_org(self):
         """Split the title from the org.
 
         Separate the title by a delimiter and test if latter half is the
         organization (if it has certain words (blog) or is too short).
         """
-        ORG_WORDS = ["blog", "lab", "center"]
-
         title = title_ori = self.get_title()
         log.info(f"title_ori = '{title_ori}'")
         org = org_ori = self.get_org()
         log.info(f"org_ori = '{org_ori}'")
-        STRONG_DELIMTERS = re.compile(r"\s[\|—«»]\s")
-        WEAK_DELIMITERS = re.compile(r"[:;-]\s")
-        if STRONG_DELIMTERS.search(title_ori):
-            log.info("STRONG_DELIMTERS")
-            parts = STRONG_DELIMTERS.split(title_ori)
+        parts = RE_STRONG_DELIMITERS.split(title_ori)
+        if len(parts) > 1:
+            log.info("STRONG_DELIMITERS")
         else:
             log.info("WEAK_DELIMITERS")
-            parts = WEAK_DELIMITERS.split(title_ori)
+            parts = RE_WEAK_DELIMITERS.split(title_ori)
         log.info(f"parts = '{parts}'")
         if len(parts) >= 2:
             beginning, end = " : ".join(parts[0:-1]), parts[-1]
             title, org = beginning, end
             title_c14n = title.replace(" ", "").lower()
             org_c14n = org.replace(" ", "").lower()
-            if org_ori.lower() in org_c14n.lower():
-                log.info("org_ori.lower() in org_c14n.lower(): pass")
+            org_ori_lower = org_ori.lower()
+            if org_ori_lower in org_c14n:
+                log.info("org_ori.lower() in org_c14n: pass")
                 title, org = " ".join(parts[0:-1]), parts[-1]
-            elif org_ori.lower() in title_c14n:
+            elif org_ori_lower in title_c14n:
                 log.info("org_ori.lower() in title_c14n: switch")
                 title, org = parts[-1], " ".join(parts[0:-1])
             else:
@@ -245,9 +385,7 @@ class ScrapeDefault:
                     % (len(end), len(beginning + end), end_ratio)
                 )
                 # if beginning has org_word or end is large (>50%): switch
-                if end_ratio > 0.5 or any(
-                    word.lower() in beginning for word in ORG_WORDS
-                ):
+                if end_ratio > 0.5 or RE_ORG_WORDS.search(beginning):
                     log.info("ratio and org_word: switch")
                     title = end
                     org = beginning
@@ -255,10 +393,11 @@ class ScrapeDefault:
             org = org.strip()
         return title, org
 
+    @memoize
     def get_org(self):
         if self.url.startswith("file:"):
             return "local file"
-        org_chunks = urlparse(self.url).netloc.split(".")
+        org_chunks = self.get_url_parts().netloc.split(".")
         if org_chunks == [""]:
             org = ""
         elif org_chunks[0] in ("www"):
@@ -271,18 +410,28 @@ class ScrapeDefault:
 
     def get_excerpt(self):
         """Select a paragraph if it is long enough and textual."""
-        if self.text:
-            lines = self.text.split("\n")
-            for line in lines:
-                line = " ".join(line.split())  # removes redundant space
-                if len(line) >= 250:
-                    line = smart_to_markdown(line)
-                    log.info(f"line = '{line}'")
-                    log.info(f"length = {len(line)}; 2nd_char = '{line[1]}'")
-                    if line[1].isalpha():
-                        excerpt = line
-                        return excerpt.strip()
+        if self.html_p is None:
+            return ""
+        # prefer long <p>s from the tree, then long lines of other blocks
+        lines = (XPATH_NORMALIZED_TEXT(p) for p in XPATH_LONG_PARAGRAPHS(self.html_p))
+        for line in lines:
+            if excerpt := self.check_excerpt(line):
+                return excerpt
+        for line_match in RE_LONG_LINE.finditer(self.text):
+            line = " ".join(line_match.group().split())  # removes redundant space
+            if len(line) >= 250 and (excerpt := self.check_excerpt(line)):
+                return excerpt
+        return ""
+
+    def check_excerpt(self, line: str) -> str:
+        """Return the line as markdown if it is textual, else ''."""
+        line = smart_to_markdown(line)
+        log.info(f"line = '{line}'")
+        log.info(f"length = {len(line)}; 2nd_char = '{line[1]}'")
+        if line[1].isalpha():
+            return line.strip()
         return ""
 
+    @memoize
     def get_permalink(self):
         return self.url
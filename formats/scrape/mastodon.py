@@ -10,21 +10,16 @@ __version__ = "1.0"
 
 
 # import textwrap
-import mastodon  # https://mastodonpy.readthedocs.io/en/stable/
-
 import utils.text as ut
 import utils.web as uw
 
 from .default import ScrapeDefault
 
-api = mastodon.Mastodon(
-    access_token=uw.get_credential("OHAI_ACCESS_TOKEN"),
-    api_base_url=uw.get_credential("MASTODON_APP_BASE"),
-)
-
 
 class ScrapeMastodon(ScrapeDefault):
     def __init__(self, url, comment):
+        import mastodon  # https://mastodonpy.readthedocs.io/en/stable/
+
         print("Scraping mastodon", end="\n")
         ScrapeDefault.__init__(self, url, comment)
 
@@ -34,7 +29,7 @@ class ScrapeMastodon(ScrapeDefault):
         else:
             raise RuntimeError("cannot identify message ID in {url}")
         try:
-            self.status = api.status(id=identity)
+            self.status = uw.get_mastodon_client().status(id=identity)
         except mastodon.MastodonError as err:
             print(err)
             raise err
@@ -12,7 +12,6 @@ __version__ = "1.0"
 import logging as log
 import re
 import time
-from datetime import datetime
 from urllib.parse import urlparse, urlunparse
 
 from change_case import sentence_case
@@ -21,6 +20,15 @@ from utils.web import get_JSON
 from .default import ScrapeDefault
 
 NOW = time.localtime()
+RE_REDDIT_URL = re.compile(
+    r"""
+    (?P<prefix>http.*?reddit\.com/)
+    (?P<root>(r/[\w\.]+)|(u(ser)?/\w+)|(wiki/\w+))
+    (?P<post>/comments/(?P<pid>\w+)/(?P<title>\w+)/)?
+    (?P<comment>(?P<cid>\w+))?
+    """,
+    re.VERBOSE,
+)
 
 
 class ScrapeReddit(ScrapeDefault):
@@ -28,16 +36,6 @@ class ScrapeReddit(ScrapeDefault):
         print("Scraping reddit", end="\n")
         ScrapeDefault.__init__(self, url_clean, comment)
 
-        RE_REDDIT_URL = re.compile(
-            r"""
-                (?P<prefix>http.*?reddit\.com/)
-                (?P<root>(r/[\w\.]+)|(u(ser)?/\w+)|(wiki/\w+))
-                (?P<post>/comments/(?P<pid>\w+)/(?P<title>\w+)/)?
-                (?P<comment>(?P<cid>\w+))?
-                """,
-            re.VERBOSE,
-        )
-
         self.type = "unknown"
         url_parsed = urlparse(url_clean)._replace(query="", fragment="")
         url_clean = urlunparse(url_parsed)
@@ -112,7 +110,7 @@ class ScrapeReddit(ScrapeDefault):
             created = self.json[0]["data"]["children"][0]["data"]["created"]
         if self.type == "comment":
             created = self.json[1]["data"]["children"][0]["data"]["created"]
-        date = datetime.fromtimestamp(created).strftime("%Y%m%d")
+        date = time.strftime("%Y%m%d", time.localtime(created))
         return date.strip()
 
     def get_excerpt(self):
@@ -10,12 +10,32 @@ import json
 import logging as log
 import pprint
 import sys
+import time
 
 import arrow
 import requests  # type: ignore
 
+import config
+
+# a book's details rarely change, so keep what the services returned
+ISBN_CACHE_DIR = config.TMP_DIR / "isbn"
+ISBN_CACHE_TTL = 30 * 24 * 60 * 60  # seconds
+
 
 def query(isbn: str):
+    """Query available ISBN services, or the cache of earlier answers."""
+    cache_fn = ISBN_CACHE_DIR / f"{isbn.removeprefix('isbn:').replace('-', '')}.json"
+    if cache_fn.exists() and time.time() - cache_fn.stat().st_mtime < ISBN_CACHE_TTL:
+        log.info(f"using cached {cache_fn}")
+        return json.loads(cache_fn.read_text(encoding="utf-8"))
+    bib = query_services(isbn)
+    if "author" in bib:  # don't keep a partial answer the services may fill later
+        ISBN_CACHE_DIR.mkdir(exist_ok=True)
+        cache_fn.write_text(json.dumps(bib), encoding="utf-8")
+    return bib
+
+
+def query_services(isbn: str):
     """Query available ISBN services."""
     bib = {}
     bib_open = bib_google = None
@@ -55,22 +75,18 @@ def open_query(isbn: str):
             json_result = json.loads(r.content)
             json_vol = json_result[f"ISBN:{isbn}"]
             json_details = json_vol["details"]
-            for key, value in list(json_details.items()):
+            for key, value in json_details.items():
                 if key == "authors":
-                    json_bib["author"] = ", ".join(
-                        [author["name"] for author in json_details["authors"]]
-                    )
+                    json_bib["author"] = ", ".join([author["name"] for author in value])
                 if key == "by_statement":
-                    json_bib["author"] = json_details["by_statement"]
+                    json_bib["author"] = value
                 elif key == "publishers":
-                    json_bib["publisher"] = json_details[key][0]
+                    json_bib["publisher"] = value[0]
                 elif key == "publish_places":
-                    json_bib["address"] = json_details[key][0]
+                    json_bib["address"] = value[0]
                 elif key == "publish_date":
                     try:
-                        json_bib["date"] = arrow.get(json_details[key]).format(
-                            "YYYYMMDD"
-                        )
+                        json_bib["date"] = arrow.get(value).format("YYYYMMDD")
                     except arrow.parser.ParserError as error:
                         print(f"Failed to parse time string: {error}")
                         return False
@@ -112,7 +128,7 @@ def google_query(isbn):
             print(f"Google unknown ISBN for {isbn}")
             return False
         json_vol = json_result["items"][0]["volumeInfo"]
-        for key, value in list(json_vol.items()):
+        for key, value in json_vol.items():
             if key == "authors":
                 json_bib["author"] = ", ".join(value)
             if key == "publishedDate":
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+#
+# This file is part of Thunderdell/BusySponge
+# <https://reagle.org/joseph/2009/01/thunderdell>
+# (c) Copyright 2009-2023 by Joseph Reagle
+# Licensed under the GPLv3, see <http://www.gnu.org/licenses/gpl-3.0.html>
+#
+"""Test the on-disk cache of ISBN query results.
+
+Run in parent folder as `pytest tests`.
+"""
+
+import json
+import os
+
+import pytest
+
+import isbn_query
+
+OPEN_LIBRARY = {
+    "ISBN:0472069322": {
+        "details": {
+            "title": "Sociology of the Internet",
+            "authors": [{"name": "Jane Doe"}],
+            "publishers": ["University of Michigan Press"],
+        }
+    }
+}
+
+
+class FakeResponse:
+    """Stand in for a `requests` response."""
+
+    def __init__(self, content: dict):
+        self.headers = {"content-type": "application/json"}
+        self.content = json.dumps(content).encode()
+
+
+@pytest.fixture
+def calls(monkeypatch, tmp_path):
+    """Serve canned Open Library answers and count the requests made."""
+    urls = []
+
+    def fake_get(url, *args, **kwargs):
+        urls.append(url)
+        if "openlibrary" in url:
+            return FakeResponse(OPEN_LIBRARY)
+        return FakeResponse({"totalItems": 0})
+
+    monkeypatch.setattr(isbn_query.requests, "get", fake_get)
+    monkeypatch.setattr(isbn_query, "ISBN_CACHE_DIR", tmp_path)
+    return urls
+
+
+def test_query_is_cached(calls):
+    """A second query is answered from the cache."""
+    bib = isbn_query.query("isbn:0-472-06932-2")
+    assert bib["author"] == "Jane Doe"
+    assert len(calls) == 1
+    assert isbn_query.query("isbn:0472069322") == bib
+    assert len(calls) == 1
+
+
+def test_stale_cache_is_refetched(calls, tmp_path):
+    """A cached answer older than the TTL is queried again."""
+    isbn_query.query("isbn:0472069322")
+    cache_fn = tmp_path / "0472069322.json"
+    stale = cache_fn.stat().st_mtime - isbn_query.ISBN_CACHE_TTL - 1
+    os.utime(cache_fn, (stale, stale))
+    isbn_query.query("isbn:0472069322")
+    assert len(calls) == 2
+
+
+def test_authorless_result_is_not_cached(calls, monkeypatch, tmp_path):
+    """A result without an author is not kept, so it is queried again."""
+    monkeypatch.delitem(OPEN_LIBRARY["ISBN:0472069322"]["details"], "authors")
+    bib = isbn_query.query("isbn:0472069322")
+    assert "author" not in bib
+    assert not (tmp_path / "0472069322.json").exists()
+    isbn_query.query("isbn:0472069322")
+    assert len(calls) == 4  # Open Library and Google, twice
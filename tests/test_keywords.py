@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+#
+# This file is part of Thunderdell/BusySponge
+# <https://reagle.org/joseph/2009/01/thunderdell>
+# (c) Copyright 2009-2023 by Joseph Reagle
+# Licensed under the GPLv3, see <http://www.gnu.org/licenses/gpl-3.0.html>
+#
+"""Check the keyword shortcut lists for collisions.
+
+Run in parent folder as `pytest tests`.
+"""
+
+from biblio.keywords import find_shortcut_collisions
+
+# shortcuts knowingly given different keywords in different lists
+ACCEPTED_COLLISIONS = {"aut"}
+
+
+def test_no_new_shortcut_collisions():
+    """Shortcuts may only collide if they've been accepted."""
+    collisions = find_shortcut_collisions()
+    assert set(collisions) <= ACCEPTED_COLLISIONS, collisions
@@ -10,9 +10,10 @@ __version__ = "1.0"
 
 
 import logging as log
-from datetime import datetime
+import re
+from datetime import date, datetime
 
-import dateutil.parser as du  # type: ignore
+RE_ISO_DATE = re.compile(r"(\d{4})-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])(?:[T ]|$)")
 
 
 def parse_date(date_str: str, date_format: str = "%Y%m%d") -> str:
@@ -24,11 +25,52 @@ def parse_date(date_str: str, date_format: str = "%Y%m%d") -> str:
     '20210216'
     >>> parse_date("2021-02-16T11:20:00Z")
     '20210216'
+    >>> parse_date("2021-02-16", "%Y")
+    '2021'
+    >>> try:
+    ...     parse_date("2021-02-31")
+    ... except ValueError:
+    ...     print("invalid")
+    invalid
     """
+    if date_format == "%Y%m%d" and (match := RE_ISO_DATE.match(date_str)):
+        # ISO dates, as in most meta tags, need not go through dateutil
+        year, month, day = match.groups()
+        try:
+            date(int(year), int(month), int(day))
+        except ValueError:
+            pass  # impossible day of the month, leave it to dateutil to reject
+        else:
+            return year + month + day
     if date_str.isdigit() and len(date_str) == 10:
         # Epoch timestamp in seconds
         dt_result = datetime.fromtimestamp(int(date_str))
     else:
         # ISO-like or other format
+        import dateutil.parser as du  # type: ignore
+
         dt_result = du.parse(date_str)
     return dt_result.strftime(date_format)
+
+
+def format_date_parts(date_parts: list) -> str:
+    """Format CSL-JSON "date-parts" (e.g., [2007, 3]) as a compact date.
+
+    >>> format_date_parts([2007, 3, 9])
+    '20070309'
+    >>> format_date_parts(["2007", "3"])
+    '200703'
+    >>> format_date_parts([2007])
+    '2007'
+    >>> format_date_parts([])
+    '0000'
+    """
+    if len(date_parts) == 3:
+        year, month, day = date_parts
+        return f"{int(year)}{int(month):02d}{int(day):02d}"
+    if len(date_parts) == 2:
+        year, month = date_parts
+        return f"{int(year)}{int(month):02d}"
+    if len(date_parts) == 1:
+        return str(date_parts[0])
+    return "0000"
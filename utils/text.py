@@ -12,23 +12,26 @@ __version__ = "1.0"
 import re
 import unicodedata
 
+LATEX_TABLE = str.maketrans(
+    {
+        "$": r"\$",
+        "&": r"\&",
+        "%": r"\%",
+        "#": r"\#",
+        "_": r"\_",
+        "{": r"\{",
+        "}": r"\}",
+        "~": r"\~{}",
+        "^": r"\^{}",
+    }
+)
+MARKDOWN_TABLE = str.maketrans(
+    {"“": '"', "”": '"', "‘": "'", "’": "'", "–": "--", "—": "---"}
+)
+
 
 def escape_latex(text: str) -> str:
-    return f"{text}".translate(
-        str.maketrans(
-            {
-                "$": r"\$",
-                "&": r"\&",
-                "%": r"\%",
-                "#": r"\#",
-                "_": r"\_",
-                "{": r"\{",
-                "}": r"\}",
-                "~": r"\~{}",
-                "^": r"\^{}",
-            }
-        )
-    )
+    return f"{text}".translate(LATEX_TABLE)
 
 
 def normalize_whitespace(text: str) -> str:
@@ -70,10 +73,12 @@ def strip_accents(text: str) -> str:
 
 
 def smart_to_markdown(text: str) -> str:
-    """Convert smart quotes and dashes to markdown format."""
-    return text.translate(
-        str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'", "–": "--", "—": "---"})
-    )
+    """Convert smart quotes and dashes to markdown format.
+
+    >>> print(smart_to_markdown("“Wait”—it’s 1–2"))
+    "Wait"---it's 1--2
+    """
+    return text.translate(MARKDOWN_TABLE)
 
 
 def html_to_text(text: str) -> str:
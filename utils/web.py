@@ -8,6 +8,7 @@ __copyright__ = "Copyright (C) 2009-2023 Joseph Reagle"
 __license__ = "GLPv3"
 __version__ = "1.0"
 
+import functools
 import html.entities
 import json
 import logging as log
@@ -15,14 +16,13 @@ import os
 import re
 from pathlib import Path
 from typing import Any
-from xml.sax.saxutils import escape  # unescape
 
 import dotenv
 import requests  # http://docs.python-requests.org/en/latest/
 from lxml import etree  # type: ignore
 
 import config
-from biblio.keywords import KEY_SHORTCUTS
+from biblio.keywords import hashify_tags
 
 log = log.getLogger("utils_web")
 
@@ -74,6 +74,15 @@ def get_HTML(
     return HTML_bytes, HTML_parsed, HTML_unicode, req
 
 
+@functools.lru_cache(maxsize=128)
+def get_HTML_cached(url: str) -> tuple[bytes, etree._Element, str, requests.Response]:
+    """Return get_HTML of a URL, fetching it only once per session.
+
+    Callers share the parsed tree, so must not modify it.
+    """
+    return get_HTML(url)
+
+
 def get_JSON(
     url,
     referer="",
@@ -99,11 +108,52 @@ def get_JSON(
         raise OSError(f"URL content is not JSON. {url=}")
 
 
-def get_text(url: str) -> str:
-    """Textual version of url."""
-    import os
+# How elements are laid out when rendering a page as text
+# fmt: off
+TEXT_BLOCK_TAGS = frozenset((
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table",
+    "tr", "ul",
+))
+# fmt: on
+TEXT_CELL_TAGS = frozenset(("td", "th"))
+TEXT_SKIP_TAGS = frozenset(("head", "noscript", "script", "style", "template"))
+LINE_MARK = "\x1e"  # source newlines are mere whitespace, so mark real breaks
+CELL_MARK = "\x1f"  # stands in for a cell boundary until lines are squeezed
+TEXT_MARKS = dict.fromkeys(TEXT_BLOCK_TAGS, LINE_MARK) | dict.fromkeys(
+    TEXT_CELL_TAGS, CELL_MARK
+)
+
+
+def get_text(html_p: etree._Element) -> str:
+    r"""Textual version of a parsed page, a line per block as a text browser would.
+
+    >>> get_text(etree.HTML("<p>By  Joe\n Smith</p><script>x</script><p>Hi <b>all</b>"))
+    'By Joe Smith\nHi all'
+    >>> get_text(etree.HTML("<table><tr><td>Posted</td><td>by Joe</td></tr></table>"))
+    'Posted   by Joe'
+    """
 
-    return str(os.popen(f'w3m -O utf8 -cols 10000 -dump "{url}"').read())
+    def walk(element: etree._Element) -> None:
+        tag = element.tag
+        if isinstance(tag, str) and tag not in TEXT_SKIP_TAGS:  # skip comments too
+            mark = TEXT_MARKS.get(tag, "")
+            chunks.append(mark)
+            chunks.append(element.text or "")
+            for child in element:
+                walk(child)
+            chunks.append(mark)
+        chunks.append(element.tail or "")
+
+    chunks: list[str] = []
+    walk(html_p)
+    lines = []
+    for line in "".join(chunks).split(LINE_MARK):
+        cells = (" ".join(cell.split()) for cell in line.split(CELL_MARK))
+        if line := "   ".join(cell for cell in cells if cell):
+            lines.append(line)
+    return "\n".join(lines)
 
 
 def yasn_publish(comment: str, title: str, subtitle: str, url: str, tags: str) -> None:
@@ -112,9 +162,7 @@ def yasn_publish(comment: str, title: str, subtitle: str, url: str, tags: str) -
     photo_path = None
 
     if tags and tags[0] != "#":  # they've not yet been hashified
-        tags = " ".join(
-            [f"#{KEY_SHORTCUTS.get(tag, tag)}" for tag in tags.strip().split(" ")]
-        )
+        tags = hashify_tags(tags)
     comment, title, subtitle, url, tags = (
         v.strip() if isinstance(v, str) else ""
         for v in [comment, title, subtitle, url, tags]
@@ -136,13 +184,11 @@ def yasn_publish(comment: str, title: str, subtitle: str, url: str, tags: str) -
     if url.startswith("file://"):
         url = ""
     total_len = len(comment) + len(tags) + len(title) + len(url)
-    log.info(
-        f"""comment = {len(comment)}: {comment}
+    log.info(f"""comment = {len(comment)}: {comment}
          title = {len(title)}: {title}
          url = {len(url)}: {url}
          tags = {len(tags)}: {tags}
-         {total_len=}"""
-    )
+         {total_len=}""")
 
     bluesky_update(comment, title, url, tags, photo_path)
     mastodon_update(comment, title, url, tags, photo_path)
@@ -156,18 +202,12 @@ def bluesky_update(
     # https://docs.bsky.app/docs/advanced-guides/posts#images-embeds
     # https://github.com/MarshalX/atproto
     import atproto_core
-    from atproto import Client, client_utils, models
-
-    import utils.web as uw
-
-    BLUESKY_APP_PASSWORD = uw.get_credential("BLUESKY_APP_PASSWORD")
-    BLUESKY_HANDLE = uw.get_credential("BLUESKY_HANDLE")
+    from atproto import client_utils, models
 
     skeet_text = shrink_message("bluesky", comment, title, "", tags) + "\n"
 
     try:
-        client = Client()
-        client.login(BLUESKY_HANDLE, BLUESKY_APP_PASSWORD)
+        client = get_bluesky_client()
         # Pass empty string instead of URL, which is added via TextBuilder.link()
         # Append new line because no separation otherwise
         skeet_obj = client_utils.TextBuilder().text(skeet_text).link(url, url)
@@ -192,20 +232,25 @@ def bluesky_update(
         print(f"skeet worked {len(skeet_obj.build_text())}: {skeet_obj.build_text()}")
 
 
+@functools.cache
+def get_bluesky_client():
+    """Return a Bluesky client, logged in once per process."""
+    from atproto import Client
+
+    client = Client()
+    client.login(
+        get_credential("BLUESKY_HANDLE"), get_credential("BLUESKY_APP_PASSWORD")
+    )
+    return client
+
+
 def mastodon_update(
     comment: str, title: str, url: str, tags: str, photo_path: Path | None
 ) -> None:
     """Update the authenticated Mastodon account with a tweet and optional photo."""
     import mastodon  # https://mastodonpy.readthedocs.io/en/stable/
 
-    import utils.web as uw
-
-    MASTODON_APP_BASE = uw.get_credential("MASTODON_APP_BASE")
-    OHAI_ACCESS_TOKEN = uw.get_credential("OHAI_ACCESS_TOKEN")
-
-    ohai = mastodon.Mastodon(
-        access_token=OHAI_ACCESS_TOKEN, api_base_url=MASTODON_APP_BASE
-    )
+    ohai = get_mastodon_client()
     toot = shrink_message("ohai", comment, title, url, tags)
     try:
         if photo_path and photo_path.is_file():
@@ -221,10 +266,43 @@ def mastodon_update(
         print(f"toot worked {len(toot)}: {toot}")
 
 
+@functools.cache
+def get_mastodon_client():
+    """Return a Mastodon client for the ohai instance, created once per process."""
+    import mastodon  # https://mastodonpy.readthedocs.io/en/stable/
+
+    return mastodon.Mastodon(
+        access_token=get_credential("OHAI_ACCESS_TOKEN"),
+        api_base_url=get_credential("MASTODON_APP_BASE"),
+    )
+
+
 def twitter_update(
     comment: str, title: str, url: str, tags: str, photo_path: Path | None
 ) -> None:
     """Update the authenticated Twitter account with a tweet and optional photo."""
+    account = get_twitter_account()
+    if photo_path:
+        shrunk_msg = shrink_message("twitter", comment, title, "", tags)
+        result = account.tweet(
+            shrunk_msg,
+            media=[
+                {
+                    "media": str(photo_path),
+                    "alt": title or "Image",
+                }
+            ],
+        )
+    else:
+        shrunk_msg = shrink_message("twitter", comment, title, url, tags)
+        result = account.tweet(shrunk_msg)
+    log.debug(f"{result=}")
+    print(f"tweet worked {len(shrunk_msg)}: {shrunk_msg}")
+
+
+@functools.cache
+def get_twitter_account():
+    """Return a Twitter account session, from saved cookies or a new login."""
     import orjson
     from httpx import Client
 
@@ -232,12 +310,6 @@ def twitter_update(
     from twitter.account import Account
     from twitter.util import init_session
 
-    import utils.web as uw
-
-    TW_EMAIL = uw.get_credential("TW_EMAIL")
-    TW_PASSWORD = uw.get_credential("TW_PASSWORD")
-    TW_USERNAME = uw.get_credential("TW_USERNAME")
-
     # https://github.com/trevorhobenshield/twitter-api-client/issues/64
     cookies_fp = config.TMP_DIR / "twitter.cookies"
     # TODO: deal with expired cookies 2023-06-06
@@ -249,7 +321,10 @@ def twitter_update(
     else:
         session = init_session()
         account = Account(
-            email=TW_EMAIL, username=TW_USERNAME, password=TW_PASSWORD, save=False
+            email=get_credential("TW_EMAIL"),
+            username=get_credential("TW_USERNAME"),
+            password=get_credential("TW_PASSWORD"),
+            save=False,
         )
         cookies = {
             k: v
@@ -258,23 +333,7 @@ def twitter_update(
         }
         cookies_fp.write_bytes(orjson.dumps(cookies))
         log.info(f"using new {cookies=}")
-
-    if photo_path:
-        shrunk_msg = shrink_message("twitter", comment, title, "", tags)
-        result = account.tweet(
-            shrunk_msg,
-            media=[
-                {
-                    "media": str(photo_path),
-                    "alt": title or "Image",
-                }
-            ],
-        )
-    else:
-        shrunk_msg = shrink_message("twitter", comment, title, url, tags)
-        result = account.tweet(shrunk_msg)
-    log.debug(f"{result=}")
-    print(f"tweet worked {len(shrunk_msg)}: {shrunk_msg}")
+    return account
 
 
 def get_photo_desc(photo_path: Path) -> str:
@@ -283,53 +342,31 @@ def get_photo_desc(photo_path: Path) -> str:
     return " ".join(chunk for chunk in photo_fn.split("-") if not chunk.isdigit())
 
 
-def shrink_message(service: str, comment: str, title: str, url: str, tags: str) -> str:
-    """Shrink message to fit into character limit."""
-    limit = 500
-    if service == "ohai":  # mastodon instance
-        limit = 500
-    elif service == "twitter":
-        limit = 280
-    elif service == "bluesky":
-        limit = 300
-    log.info(f"{comment=}")
-    PADDING = 7  # = comment_delim + title quotes + spaces
-    TWITTER_SHORTENER_LEN = 23  # twitter uses t.co
-    limit -= PADDING
+MESSAGE_LIMITS = {"ohai": 500, "twitter": 280, "bluesky": 300}  # mastodon is ohai
+TWITTER_SHORTENER_LEN = 23  # twitter uses t.co
 
-    log.info(f"{limit=}")
-    message_room = limit - len_twitter(tags)
-    log.info(f"message_room - len(tags) = {message_room}")
 
-    log.info(f"{len_twitter(url)=}")
-    if service == "twitter" and len_twitter(url) > TWITTER_SHORTENER_LEN:
-        message_room = message_room - TWITTER_SHORTENER_LEN
-        log.info(f"  shortened to {TWITTER_SHORTENER_LEN}")
-    else:
-        message_room = message_room - len_twitter(url)
-    log.info(f"message_room after url = {message_room}")
+def shrink_message(service: str, comment: str, title: str, url: str, tags: str) -> str:
+    """Shrink message to fit into character limit.
 
-    log.info(f"{len_twitter(title)=}")
-    if len_twitter(title) > message_room:
-        log.info("title is too long")
+    >>> shrink_message("twitter", "Great read", "A title", "https://example.com", "#wp")
+    'Great read: “A title” https://example.com #wp'
+    """
+    PADDING = 7  # = comment_delim + title quotes + spaces
+    url_len = len_twitter(url)
+    if service == "twitter":
+        url_len = min(url_len, TWITTER_SHORTENER_LEN)
+    message_room = MESSAGE_LIMITS.get(service, 500) - PADDING
+    message_room -= len_twitter(tags) + url_len
+
+    title_len = len_twitter(title)
+    if title_len > message_room:
         title = f"{title[:message_room - 1]}…"
-        log.info(f"  truncated to {len_twitter(title)}")
-    message_room = message_room - len_twitter(title)
-    log.info(f"{message_room=} after title = ")
+        title_len = len_twitter(title)
+    message_room -= title_len
 
-    log.info(f"{len_twitter(comment)=}")
     if len_twitter(comment) > message_room:
-        log.info("comment is too long")
-        if message_room > 5:
-            log.info(" truncating")
-            comment = f"{comment[:message_room - 1]}…"
-            log.info(f"  truncated to {len_twitter(comment)}")
-            log.info(f"{comment}")
-        else:
-            log.info(" skipping")
-            comment = ""
-    message_room = message_room - len_twitter(comment)
-    log.info(f"message_room after comment = {message_room}")
+        comment = f"{comment[:message_room - 1]}…" if message_room > 5 else ""
 
     comment_delim = ": " if comment and title else ""
     title = f"“{title}”" if title else ""
@@ -347,10 +384,16 @@ def len_twitter(text: str) -> int:
     return len(text.encode("utf-16-le")) // 2
 
 
+XML_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", "\t": "  "})
+
+
 def escape_XML(s: str) -> str:  # http://wiki.python.org/moin/EscapingXml
-    """Escape XML character entities including & < >."""
-    extras = {"\t": "  "}
-    return escape(s, extras)
+    """Escape XML character entities including & < >.
+
+    >>> escape_XML("<a href='?x=1&y=2'>A</a>")
+    "&lt;a href='?x=1&amp;y=2'&gt;A&lt;/a&gt;"
+    """
+    return s.translate(XML_TABLE)
 
 
 CURLY_TABLE = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})